@@ -9,12 +9,18 @@ from fastapi import FastAPI, HTTPException, Query, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 import json
+import logging
+
+# The matching pipeline reports its progress through logging (INFO); show it
+# in the server output. Other libraries keep the default WARNING level.
+logging.basicConfig(format="%(levelname)s:%(name)s: %(message)s")
+logging.getLogger("model_dev").setLevel(logging.INFO)
 
 # Add parent directory to path to import model_dev
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 from model_dev.main import run_all_categories_from_data
-from model_dev.final_match import compute_final_matches_from_data
+from model_dev.final_match import MATCHING_METHODS, compute_final_matches_from_data
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = BASE_DIR / "data"
@@ -294,9 +300,8 @@ async def get_demo_csv(filename: str = Query(..., description="Name of the CSV f
                        f"Available files: {', '.join(available_files) if available_files else 'none'}"
             )
         
-        # Read and return CSV content
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        # Read and return CSV content (bytes as stored, no decode/re-encode round trip)
+        content = file_path.read_bytes()
         
         from fastapi.responses import Response
         return Response(content=content, media_type="text/csv")
@@ -320,6 +325,7 @@ async def compute_matching(
     geographic_max_distance: Optional[int] = Form(None),
     manual_matches_json: Optional[str] = Form(None),
     manual_non_matches_json: Optional[str] = Form(None),
+    matching_method: Optional[str] = Form(None),
 ) -> Dict[str, Any]:
     """
     Compute mentor-mentee matching scores across all categories using uploaded CSV files.
@@ -333,6 +339,7 @@ async def compute_matching(
       - geographic_max_distance: Maximum allowed geographic distance in km (default: 200)
       - manual_matches: JSON array of pairs to force as matches (format: ["mentor_id-mentee_id"])
       - manual_non_matches: JSON array of pairs to exclude (format: ["mentor_id-mentee_id"])
+      - matching_method: "greedy" (default) or "optimal" (maximum total score, needs scipy, lap or numba)
     
     The application and interview CSVs are automatically merged on their ID columns
     (Mentee Number / Mentor Number) before running the matching algorithm.
@@ -348,6 +355,14 @@ async def compute_matching(
     
     Each category's results use string keys (e.g., "1-2") for JSON compatibility.
     """
+    # Reject an unknown matching method before any scoring (or routing API) work is done
+    matching_method = matching_method or "greedy"
+    if matching_method not in MATCHING_METHODS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown matching method: {matching_method!r} (expected one of {', '.join(MATCHING_METHODS)})",
+        )
+
     try:
         # If files not provided, try to use default files from data directory
         if not all([mentor_application_file, mentor_interview_file, mentee_application_file, mentee_interview_file]):
@@ -423,7 +438,8 @@ async def compute_matching(
         final_matches = compute_final_matches_from_data(
             results,
             manual_matches=manual_matches,
-            manual_non_matches=manual_non_matches
+            manual_non_matches=manual_non_matches,
+            matching_method=matching_method,
         )
         
         # Convert tuple keys to strings for JSON serialization
@@ -12,7 +12,8 @@ type RecordType = Record<string, string>;
  * @param applicationData Array of objects from application CSV (each element is one person)
  * @param interviewData Array of objects from interview CSV (each element is one person)
  * @param idColumn Name of the ID column to merge on (e.g., "Mentee Number" or "Mentor Number")
- * @returns Merged array with combined columns from both datasets
+ * @returns Merged array with combined columns from both datasets.
+ *   The input rows are reused as the merged rows, so the input arrays should not be used afterwards.
  */
 export function mergeApplicationAndInterview(
   applicationData: RecordType[],
@@ -61,41 +62,47 @@ export function mergeApplicationAndInterview(
     }
   }
   
-  // Get all unique IDs from both datasets (outer join - keep all records)
-  const allIds = new Set([
-    ...applicationMap.keys(),
-    ...interviewMap.keys(),
-  ]);
+  // Count the overlap once (outer join - keep all records)
+  let idsInBoth = 0;
+  for (const id of applicationMap.keys()) {
+    if (interviewMap.has(id)) {
+      idsInBoth++;
+    }
+  }
+  const idsOnlyInInterview = interviewMap.size - idsInBoth;
   
-  console.log(`Total unique IDs: ${allIds.size}`);
-  console.log(`IDs only in application: ${Array.from(allIds).filter(id => !interviewMap.has(id)).length}`);
-  console.log(`IDs only in interview: ${Array.from(allIds).filter(id => !applicationMap.has(id)).length}`);
-  console.log(`IDs in both: ${Array.from(allIds).filter(id => applicationMap.has(id) && interviewMap.has(id)).length}`);
+  console.log(`Total unique IDs: ${applicationMap.size + idsOnlyInInterview}`);
+  console.log(`IDs only in application: ${applicationMap.size - idsInBoth}`);
+  console.log(`IDs only in interview: ${idsOnlyInInterview}`);
+  console.log(`IDs in both: ${idsInBoth}`);
   
   // Merge data: for each ID, combine columns from both datasets
+  // Hash join - probe the interview map for every application ID, then append interview-only IDs
+  // (same order as iterating the union of both key sets)
   const mergedData: RecordType[] = [];
   
-  for (const id of allIds) {
-    const appRow = applicationMap.get(id) || {};
-    const intRow = interviewMap.get(id) || {};
-    
-    // Merge objects: combine all columns from both datasets
-    // Application columns come first, interview columns override if there are conflicts (except ID)
-    const mergedRow: RecordType = {
-      ...appRow,  // Start with application data
-      ...intRow,  // Override/add interview data
-      [idColumn]: id,  // Ensure ID column is set correctly
-    };
-    
-    // Log warnings for IDs only in one dataset
-    if (!applicationMap.has(id)) {
-      console.warn(`${idColumn} ${id} found in interview but not in application`);
-    }
-    if (!interviewMap.has(id)) {
+  for (const [id, appRow] of applicationMap) {
+    const intRow = interviewMap.get(id);
+    if (!intRow) {
       console.warn(`${idColumn} ${id} found in application but not in interview`);
     }
     
-    mergedData.push(mergedRow);
+    // Application columns come first, interview columns override if there are conflicts (except ID)
+    // The application row is completed in place instead of being copied (see @param notes)
+    mergedData.push(Object.assign(
+      appRow,  // Start with application data
+      intRow,  // Override/add interview data
+      { [idColumn]: id },  // Ensure ID column is set correctly
+    ));
+  }
+  
+  for (const [id, intRow] of interviewMap) {
+    if (applicationMap.has(id)) {
+      continue;
+    }
+    console.warn(`${idColumn} ${id} found in interview but not in application`);
+    intRow[idColumn] = id;
+    mergedData.push(intRow);
   }
   
   console.log(`✓ Merged ${mergedData.length} records (combined columns from both datasets)`);
@@ -85,23 +85,18 @@ export async function loadDemoCSVFiles(): Promise<{
   };
   
   try {
-    // Load all 4 required files sequentially to catch errors early
+    // Load all 4 required files concurrently; Promise.all still rejects on the first failure
     console.log('\n=== Loading Demo CSV Files from Backend ===');
-    console.log(`Step 1/4: Loading ${fileNames.mentorApplication}`);
-    const mentorApplication = await loadDemoCSV(fileNames.mentorApplication);
-    console.log(`  ✓ Loaded ${mentorApplication.name} (${mentorApplication.size} bytes)`);
+    const [mentorApplication, mentorInterview, menteeApplication, menteeInterview] = await Promise.all([
+      loadDemoCSV(fileNames.mentorApplication),
+      loadDemoCSV(fileNames.mentorInterview),
+      loadDemoCSV(fileNames.menteeApplication),
+      loadDemoCSV(fileNames.menteeInterview),
+    ]);
     
-    console.log(`Step 2/4: Loading ${fileNames.mentorInterview}`);
-    const mentorInterview = await loadDemoCSV(fileNames.mentorInterview);
-    console.log(`  ✓ Loaded ${mentorInterview.name} (${mentorInterview.size} bytes)`);
-    
-    console.log(`Step 3/4: Loading ${fileNames.menteeApplication}`);
-    const menteeApplication = await loadDemoCSV(fileNames.menteeApplication);
-    console.log(`  ✓ Loaded ${menteeApplication.name} (${menteeApplication.size} bytes)`);
-    
-    console.log(`Step 4/4: Loading ${fileNames.menteeInterview}`);
-    const menteeInterview = await loadDemoCSV(fileNames.menteeInterview);
-    console.log(`  ✓ Loaded ${menteeInterview.name} (${menteeInterview.size} bytes)`);
+    [mentorApplication, mentorInterview, menteeApplication, menteeInterview].forEach((file, index) => {
+      console.log(`Step ${index + 1}/4: Loaded ${file.name} (${file.size} bytes)`);
+    });
     
     console.log('\n✓ All 4 demo CSV files loaded successfully from backend');
     
@@ -3,6 +3,9 @@ import pandas as pd
 from sentence_transformers import SentenceTransformer, util
 import torch
 import re
+import logging
+
+log = logging.getLogger(__name__)
 
 
 # -------------------------------
@@ -302,14 +305,14 @@ def academia_results(
                 },
             }
 
-    print(" Academia matching complete (yes/no synergy mode).")
+    log.info("Academia matching complete (yes/no synergy mode)")
     yes_uncertainty = sum(1 for _, row in mentees_df.iterrows()
                       if has_uncertainty(str(row.get("6. Do you need the support of a mentor? If yes, please give examples of how your mentor can support you", ""))) == "yes")
     yes_experience = sum(1 for _, row in mentors_df.iterrows()
                         if has_swiss_experience(str(row.get("Do you feel confident in navigating the Swiss university system?", ""))) == "yes")
 
-    print(f" Mentees needing support (yes): {yes_uncertainty}/{len(mentees_df)}")
-    print(f" Mentors with Swiss experience (yes): {yes_experience}/{len(mentors_df)}")
+    log.info("Mentees needing support (yes): %d/%d", yes_uncertainty, len(mentees_df))
+    log.info("Mentors with Swiss experience (yes): %d/%d", yes_experience, len(mentors_df))
 
     yes_experience = sum(
         1 for _, row in mentors_df.iterrows()
@@ -320,7 +323,7 @@ def academia_results(
             )
         ) == "yes"
     )
-    print(f"🔎 Mentors with Swiss experience (yes): {yes_experience}/{len(mentors_df)}")
+    log.info("Mentors with Swiss experience (yes): %d/%d", yes_experience, len(mentors_df))
 
 
 
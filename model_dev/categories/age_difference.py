@@ -18,10 +18,13 @@ This setup prioritizes mentor-mentee pairs with age gaps under ~15 years (score
 """
 
 
+import logging
 from datetime import datetime
 from typing import Any, Dict, Iterable, Optional, Tuple
 import pandas as pd
 
+log = logging.getLogger(__name__)
+
 
 # -------------------------------
 # Helper functions
@@ -113,27 +116,25 @@ def age_difference_results(
 
     all_ages = [a for a in mentee_ages + mentor_ages if a is not None]
     if not all_ages:
-        print(" No valid birth years found.")
+        log.warning("No valid birth years found")
         return {}
 
     # Use age_max_difference if provided, otherwise default to 30 years
     max_age_diff = age_max_difference if age_max_difference is not None else 30
     
     if max_age_diff <= 0:
-        print("⚠️ Warning: age_max_difference must be positive, using default 30 years")
+        log.warning("age_max_difference must be positive, using default 30 years")
         max_age_diff = 30
     
-    print(f"Using maximum age difference threshold: {max_age_diff} years")
+    log.info("Using maximum age difference threshold: %s years", max_age_diff)
 
     results: Dict[Tuple[int, int], Dict[str, Any]] = {}
 
-    for mentee_idx, mentee_row in mentees_df.iterrows():
-        mentee_id = mentee_row[mentee_id_col]
+    for mentee_idx, mentee_id in mentees_df[mentee_id_col].items():
         mentee_year = mentee_birth_years[mentee_idx]
         mentee_age = mentee_ages[mentee_idx]
 
-        for mentor_idx, mentor_row in mentors_df.iterrows():
-            mentor_id = mentor_row[mentor_id_col]
+        for mentor_idx, mentor_id in mentors_df[mentor_id_col].items():
             mentor_year = mentor_birth_years[mentor_idx]
             mentor_age = mentor_ages[mentor_idx]
 
@@ -154,5 +155,5 @@ def age_difference_results(
                 "difference_in_years": int(diff_years) if diff_years is not None else "unknown",
             }
 
-    print(f" Age difference computed for {len(results)} mentor–mentee pairs.")
+    log.info("Age difference computed for %d mentor-mentee pairs", len(results))
     return results
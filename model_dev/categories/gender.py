@@ -1,6 +1,10 @@
 from typing import Any, Dict
+import logging
 import pandas as pd
 
+log = logging.getLogger(__name__)
+
+
 def _normalize_gender(value: Any) -> str:
     text = str(value).strip().lower() if value is not None else "unknown"
     if any(tok in text for tok in ["weiblich / female", "identify as female", "female"]):
@@ -28,14 +32,22 @@ def gender_results(
 
     detailed_results: Dict[str, Dict[str, Any]] = {}
 
-    for _, mentee_row in mentees_df.iterrows():
-        mentee_id = mentee_row[mentee_id_col]
-        mentee_gender = _normalize_gender(mentee_row.get(mentee_gender_col, None))
-        mentee_pref = _normalize_gender(mentee_row.get(mentee_pref_col, None))
+    # Plain tuples instead of one Series per row; missing columns read as NaN ("unknown")
+    mentee_rows = list(
+        mentees_df.reindex(columns=[mentee_id_col, mentee_gender_col, mentee_pref_col])
+        .itertuples(index=False, name=None)
+    )
+    mentor_rows = list(
+        mentors_df.reindex(columns=[mentor_id_col, mentor_gender_col])
+        .itertuples(index=False, name=None)
+    )
+
+    for mentee_id, mentee_gender_raw, mentee_pref_raw in mentee_rows:
+        mentee_gender = _normalize_gender(mentee_gender_raw)
+        mentee_pref = _normalize_gender(mentee_pref_raw)
 
-        for _, mentor_row in mentors_df.iterrows():
-            mentor_id = mentor_row[mentor_id_col]
-            mentor_gender = _normalize_gender(mentor_row.get(mentor_gender_col, None))
+        for mentor_id, mentor_gender_raw in mentor_rows:
+            mentor_gender = _normalize_gender(mentor_gender_raw)
 
             score = 0.0
             if mentee_pref in ["male", "female"]:
@@ -53,9 +65,9 @@ def gender_results(
                 "mentor_gender": mentor_gender,
             }
 
-            print(
-                f"Mentee {mentee_id} ({mentee_gender}, wants {mentee_pref}) ↔ "
-                f"Mentor {mentor_id} ({mentor_gender}) → Score: {final_score}"
+            log.debug(
+                "Mentee %s (%s, wants %s) <-> Mentor %s (%s): score %s",
+                mentee_id, mentee_gender, mentee_pref, mentor_id, mentor_gender, final_score,
             )
 
     return detailed_results
@@ -8,61 +8,96 @@ Scoring principle:
 - For greater distances, the score declines linearly using the formula:
     score = max(0.0, 1.0 - (distance_km / max_reasonable_distance))
   By default, max_reasonable_distance is 200 km, so pairs at or above that threshold get a score of 0.0.
-- If a mapping is missing or a specific distance cannot be found, the score for that pair is 0.0.
+- If a mapping is missing or a specific distance cannot be found, the score for that pair is 0.0
+  (unless straight_line_fallback is set, see below).
 - The score is multiplied by an optional importance_modifier (default: 1.0), and remains in the [0, 1] interval.
 - The result is a dictionary mapping (mentee_id, mentor_id) tuples to float scores.
 
 Notes:
-- This scoring logic relies entirely on precomputed distances and does not invoke any geocoding or routing APIs at runtime.
-- This design ensures that scoring is deterministic and efficient, favoring pairs who are physically closer and thus have a higher likelihood of successful in-person interaction.
+- Distances and coordinates are cached on disk. Locations missing from the cache are geocoded
+  (Nominatim, then OpenCage), and pairs missing from the cache are routed with OpenRouteService
+  when an OPEN_ROUTE_SERVICE key is set.
+- With straight_line_fallback=True, pairs that still have no driving distance (no API key, or the
+  routing request was rejected) are scored on their Haversine (straight-line) distance instead of 0.0.
+- This design favors pairs who are physically closer and thus have a higher likelihood of successful in-person interaction.
 """
 
 
 
 
+import ast
+import atexit
+import email.utils
 import json
+import logging
 import math
 import os
+import random
+import re
+import sqlite3
+import threading
 import time
-from collections import deque
+import unicodedata
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 
+import numpy as np
 import openrouteservice
 import pandas as pd
 from dotenv import load_dotenv
 from geopy.geocoders import Nominatim, OpenCage
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+log = logging.getLogger(__name__)
+
 # Rate limiting for OpenRouteService: max 40 requests per minute
 _ORS_RATE_LIMIT = 40  # requests
 _ORS_RATE_WINDOW = 60  # seconds
-_ors_request_times: deque = deque()
+# Maximum number of source x destination routes per matrix request
+_ORS_MATRIX_MAX_ROUTES = 3500
+# Upper bound for the exponential retry backoff
+_RETRY_MAX_WAIT = 60.0  # seconds
+
+# Token bucket for the rate limit: refilled continuously at
+# _ORS_RATE_LIMIT / _ORS_RATE_WINDOW tokens per second. It holds at most one
+# token, so a burst can never add to the refill: no 60 s window sees more
+# than _ORS_RATE_LIMIT requests (a full bucket of 40 would allow ~80).
+_ORS_BUCKET_CAPACITY = 1.0
+_ors_tokens: float = _ORS_BUCKET_CAPACITY
+_ors_last_refill: float = time.monotonic()
+_ors_rate_lock = threading.Lock()
 
 
 def _wait_for_rate_limit():
     """Wait if needed to respect OpenRouteService rate limit (40 requests/minute)."""
-    current_time = time.time()
-    
-    # Remove timestamps older than 1 minute
-    while _ors_request_times and current_time - _ors_request_times[0] >= _ORS_RATE_WINDOW:
-        _ors_request_times.popleft()
-    
-    # If we've hit the limit, wait until the oldest request is more than 1 minute ago
-    if len(_ors_request_times) >= _ORS_RATE_LIMIT:
-        oldest_time = _ors_request_times[0]
-        wait_time = _ORS_RATE_WINDOW - (current_time - oldest_time) + 0.1  # Add small buffer
-        if wait_time > 0:
-            print(f"Rate limit reached ({_ORS_RATE_LIMIT} requests/minute), waiting {wait_time:.1f}s...")
+    global _ors_tokens, _ors_last_refill
+    rate = _ORS_RATE_LIMIT / _ORS_RATE_WINDOW
+
+    with _ors_rate_lock:
+        now = time.monotonic()
+        _ors_tokens = min(_ORS_BUCKET_CAPACITY, _ors_tokens + (now - _ors_last_refill) * rate)
+        _ors_last_refill = now
+
+        if _ors_tokens < 1.0:
+            wait_time = (1.0 - _ors_tokens) / rate
+            log.debug("Rate limit reached (%d requests/minute), waiting %.1fs...", _ORS_RATE_LIMIT, wait_time)
             time.sleep(wait_time)
-            # Update current_time after waiting
-            current_time = time.time()
-            # Clean up old timestamps again
-            while _ors_request_times and current_time - _ors_request_times[0] >= _ORS_RATE_WINDOW:
-                _ors_request_times.popleft()
-    
-    # Record this API call
-    _ors_request_times.append(time.time())
+            _ors_tokens = 1.0
+            _ors_last_refill = time.monotonic()
+
+        _ors_tokens -= 1.0
 
 # Load .env file if it exists
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -75,74 +110,300 @@ CACHE_DIR = BASE_DIR / "temp" / "geographic_data"
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 LOCATION_CACHE_FILE = CACHE_DIR / "location_mappings.json"
+# New geocoding results are appended here and folded into LOCATION_CACHE_FILE on compaction
+LOCATION_LOG_FILE = CACHE_DIR / "location_mappings.jsonl"
+# Tracked copy of the distance cache: merged into the database on load and
+# re-exported from it whenever new distances were computed (see _flush_caches)
 DISTANCE_CACHE_FILE = CACHE_DIR / "distances.json"
+DISTANCE_DB_FILE = CACHE_DIR / "distances.db"
 
-# In-memory cache dictionaries
+# Distance cache keys: each (lon, lat) is quantized to integer microdegrees and
+# the two points are stored in sorted order, so the key is order-independent.
+_CoordKey = Tuple[int, int]
+_DistanceKey = Tuple[_CoordKey, _CoordKey]
+
+# In-memory cache dictionaries. Locations are looked up by their normalized
+# form (see _normalize_location); _location_entries keeps them as spelled in
+# the data, which is what is written back to LOCATION_CACHE_FILE.
 _location_cache: Dict[str, Optional[Tuple[float, float]]] = {}
-_distance_cache: Dict[str, float] = {}
+_location_entries: Dict[str, Optional[Tuple[float, float]]] = {}
+_distance_cache: Dict[_DistanceKey, float] = {}
+
+# Distances are persisted in SQLite (WAL mode), so each new distance is a
+# single-row insert and concurrent runs can share the cache safely. The
+# database is opened the first time distances are needed, not at import.
+_distance_db: Optional[sqlite3.Connection] = None
+_distances_loaded = False
+# Set when a distance was added since the last export to DISTANCE_CACHE_FILE
+_distances_dirty = False
+
+
+@lru_cache(maxsize=4096)
+def _normalize_location(location_str: str) -> str:
+    """
+    Canonical form of a location string used as the location cache key:
+    accents removed, lowercased, whitespace collapsed ("  Zürich " -> "zurich").
+    """
+    text = unicodedata.normalize("NFKD", location_str)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+def _read_json(path: Path) -> Any:
+    """Read a JSON cache file, using orjson when it is installed."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
 
 
 def _load_cache():
-    """Load cached location mappings and distances from disk."""
-    global _location_cache, _distance_cache
+    """Load cached location mappings from disk."""
+    global _location_cache, _location_entries
     
     # Load location mappings
+    _location_cache, _location_entries = {}, {}
     if LOCATION_CACHE_FILE.exists():
         try:
-            with open(LOCATION_CACHE_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _read_json(LOCATION_CACHE_FILE)
+            for name, coords in data.items():
                 # Convert lists back to tuples
-                _location_cache = {
-                    k: tuple(v) if v is not None else None 
-                    for k, v in data.items()
-                }
-                print(f"Loaded {len(_location_cache)} location mappings from cache")
+                _set_location(name, tuple(coords) if coords is not None else None)
+            log.info("Loaded %d location mappings from cache", len(_location_cache))
         except Exception as e:
-            print(f"Warning: Failed to load location cache: {e}")
-            _location_cache = {}
-    else:
-        _location_cache = {}
-    
-    # Load distance calculations
-    if DISTANCE_CACHE_FILE.exists():
+            log.warning("Failed to load location cache: %s", e)
+            _location_cache, _location_entries = {}, {}
+    _replay_location_log()
+
+
+def _load_distance_cache():
+    """Load cached distances from disk (once, on first use)."""
+    global _distance_cache, _distances_loaded
+    with _cache_lock:
+        if _distances_loaded:
+            return
+        _distances_loaded = True
         try:
-            with open(DISTANCE_CACHE_FILE, 'r', encoding='utf-8') as f:
-                _distance_cache = json.load(f)
-                print(f"Loaded {len(_distance_cache)} distance calculations from cache")
+            db = _get_distance_db()
+            if DISTANCE_CACHE_FILE.exists():
+                _import_distances_json(db)
+            _distance_cache = {_key_from_str(k): v for k, v in db.execute("SELECT k, v FROM d")}
+            log.info("Loaded %d distance calculations from cache", len(_distance_cache))
         except Exception as e:
-            print(f"Warning: Failed to load distance cache: {e}")
+            log.warning("Failed to load distance cache: %s", e)
             _distance_cache = {}
+
+
+def _get_distance_db() -> sqlite3.Connection:
+    """Open (once) the SQLite distance cache and make sure its table exists."""
+    global _distance_db
+    if _distance_db is None:
+        conn = sqlite3.connect(DISTANCE_DB_FILE, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS d(k TEXT PRIMARY KEY, v REAL)")
+        _distance_db = conn
+    return _distance_db
+
+
+def _import_distances_json(db: sqlite3.Connection):
+    """
+    Merge the distances from distances.json into the database. Entries already
+    in the database are kept, so a fresh checkout (empty database) is filled
+    from the tracked file and an existing database picks up pulled entries.
+    """
+    data = _read_json(DISTANCE_CACHE_FILE)
+    with db:
+        db.execute("BEGIN")
+        db.executemany(
+            "INSERT OR IGNORE INTO d VALUES (?, ?)",
+            ((_key_to_str(_key_from_str(k)), v) for k, v in data.items()),
+        )
+    log.info("Merged %d distance calculations from %s", len(data), DISTANCE_CACHE_FILE.name)
+
+
+def _export_distances():
+    """Write every distance in the database back to distances.json (in insertion order)."""
+    try:
+        rows = _get_distance_db().execute("SELECT k, v FROM d ORDER BY rowid").fetchall()
+        _write_json_atomic(DISTANCE_CACHE_FILE, dict(rows), indent=True)
+    except Exception as e:
+        log.warning("Failed to export distance cache: %s", e)
+
+
+def _write_json_atomic(path: Path, data: Any, indent: bool = False) -> None:
+    """
+    Write JSON (compact, or indented for tracked files) to a temporary file and
+    swap it in, so readers never see a partial file. Tracked files are written
+    by json exactly as before (indent=2, non-ASCII escaped), so an unchanged
+    cache does not show up as a diff.
+    """
+    if indent:
+        raw = json.dumps(data, indent=2).encode("utf-8")
+    elif orjson is not None:
+        raw = orjson.dumps(data)
     else:
-        _distance_cache = {}
+        raw = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(raw)
+    os.replace(tmp_path, path)
+
+
+def _replay_location_log():
+    """Apply the entries appended to the location log since the last compaction."""
+    global _location_log_entries
+    _location_log_entries = 0
+    if not LOCATION_LOG_FILE.exists():
+        return
+    with open(LOCATION_LOG_FILE, 'rb') as f:
+        for line in f:
+            try:
+                entry = orjson.loads(line) if orjson is not None else json.loads(line)
+            except ValueError:
+                # A run interrupted mid-write can leave a partial last line
+                continue
+            v = entry["v"]
+            _set_location(entry["k"], tuple(v) if v is not None else None)
+            _location_log_entries += 1
+    log.info("Replayed %d location mappings from %s", _location_log_entries, LOCATION_LOG_FILE.name)
 
 
 def _save_location_cache():
-    """Save location mappings to disk."""
+    """Save location mappings to disk, under their original spelling."""
     try:
-        with open(LOCATION_CACHE_FILE, 'w', encoding='utf-8') as f:
-            # Convert tuples to lists for JSON serialization
-            data = {
-                k: list(v) if v is not None else None 
-                for k, v in _location_cache.items()
-            }
-            json.dump(data, f, indent=2)
+        # Convert tuples to lists for JSON serialization
+        data = {
+            k: list(v) if v is not None else None 
+            for k, v in _location_entries.items()
+        }
+        _write_json_atomic(LOCATION_CACHE_FILE, data, indent=True)
     except Exception as e:
-        print(f"Warning: Failed to save location cache: {e}")
+        log.warning("Failed to save location cache: %s", e)
 
 
-def _save_distance_cache():
-    """Save distance calculations to disk."""
+def _save_distance(cache_key: _DistanceKey, distance_km: float):
+    """Persist a single distance to the SQLite cache."""
     try:
-        with open(DISTANCE_CACHE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(_distance_cache, f, indent=2)
+        _get_distance_db().execute(
+            "INSERT OR REPLACE INTO d VALUES (?, ?)", (_key_to_str(cache_key), distance_km)
+        )
     except Exception as e:
-        print(f"Warning: Failed to save distance cache: {e}")
+        log.warning("Failed to save distance cache: %s", e)
+
+
+# Location cache updates are appended to LOCATION_LOG_FILE, one JSON line each.
+# The log is compacted into LOCATION_CACHE_FILE on _flush_caches() or once it
+# holds more entries than there are unique locations.
+_location_log_entries = 0
+# Guards the in-memory caches, which concurrent backend requests may update
+_cache_lock = threading.RLock()
+
+
+def _flush_caches():
+    """
+    Compact the location log into the location cache file and export newly
+    computed distances to distances.json.
+    """
+    global _location_log_entries, _distances_dirty
+    with _cache_lock:
+        if _location_log_entries:
+            _save_location_cache()
+            LOCATION_LOG_FILE.unlink(missing_ok=True)
+            _location_log_entries = 0
+        if _distances_dirty:
+            _export_distances()
+            _distances_dirty = False
+
+
+def _set_location(location_str: str, coords: Optional[Tuple[float, float]]):
+    """Put a location in the in-memory caches (normalized for lookups, as spelled for saving)."""
+    _location_cache[_normalize_location(location_str)] = coords
+    _location_entries[location_str] = coords
+
+
+def _cache_location(location_str: str, coords: Optional[Tuple[float, float]]):
+    """Store a geocoding result and append it to the location log."""
+    global _location_log_entries
+    entry = {"k": location_str, "v": list(coords) if coords is not None else None}
+    line = orjson.dumps(entry) if orjson is not None else json.dumps(entry).encode("utf-8")
+    with _cache_lock:
+        _set_location(location_str, coords)
+        try:
+            with open(LOCATION_LOG_FILE, 'ab') as f:
+                f.write(line + b"\n")
+        except Exception as e:
+            log.warning("Failed to save location cache: %s", e)
+            return
+        _location_log_entries += 1
+        if _location_log_entries > len(_location_entries):
+            _flush_caches()
+
+
+def _cache_distance(cache_key: _DistanceKey, distance_km: float):
+    """Store a distance in memory and in the SQLite cache."""
+    global _distances_dirty
+    _load_distance_cache()
+    with _cache_lock:
+        _distance_cache[cache_key] = distance_km
+        _save_distance(cache_key, distance_km)
+        _distances_dirty = True
+
 
+atexit.register(_flush_caches)
 
-def _cache_key_for_coords(coords1: Tuple[float, float], coords2: Tuple[float, float]) -> str:
+
+def _quantize_coords(coords: Tuple[float, float]) -> _CoordKey:
+    """Round (longitude, latitude) to integer microdegrees."""
+    return (round(coords[0] * 1e6), round(coords[1] * 1e6))
+
+
+def _cache_key_for_coords(coords1: Tuple[float, float], coords2: Tuple[float, float]) -> _DistanceKey:
     """Generate a cache key for a coordinate pair (order-independent)."""
-    sorted_coords = tuple(sorted([coords1, coords2]))
-    return f"{sorted_coords[0][0]:.6f},{sorted_coords[0][1]:.6f}|{sorted_coords[1][0]:.6f},{sorted_coords[1][1]:.6f}"
+    a = _quantize_coords(coords1)
+    b = _quantize_coords(coords2)
+    return (a, b) if a <= b else (b, a)
+
+
+def _key_to_str(key: _DistanceKey) -> str:
+    """Format a distance cache key as stored on disk: "lon,lat|lon,lat"."""
+    (lon1, lat1), (lon2, lat2) = key
+    return f"{lon1 / 1e6:.6f},{lat1 / 1e6:.6f}|{lon2 / 1e6:.6f},{lat2 / 1e6:.6f}"
+
+
+def _key_from_str(text: str) -> _DistanceKey:
+    """Parse an on-disk distance cache key back into its quantized form."""
+    first, second = text.split("|")
+    a = _quantize_coords(tuple(float(x) for x in first.split(",")))
+    b = _quantize_coords(tuple(float(x) for x in second.split(",")))
+    return (a, b) if a <= b else (b, a)
+
+
+# Earth diameter (2 x mean radius of 6371 km)
+_EARTH_DIAMETER_KM = 12742.0
+_DEG_TO_RAD = math.pi / 180.0
+
+
+def _haversine_km(lon1: float, lat1: float, lon2: float, lat2: float) -> float:
+    """Haversine distance in kilometers between two points given in degrees."""
+    lat1 *= _DEG_TO_RAD
+    lat2 *= _DEG_TO_RAD
+    sin_dlat = math.sin((lat2 - lat1) * 0.5)
+    sin_dlon = math.sin((lon2 - lon1) * (0.5 * _DEG_TO_RAD))
+
+    a = sin_dlat * sin_dlat + math.cos(lat1) * math.cos(lat2) * sin_dlon * sin_dlon
+    return _EARTH_DIAMETER_KM * math.atan2(math.sqrt(a), math.sqrt(1.0 - a))
+
+
+@lru_cache(maxsize=1)
+def _haversine_kernel():
+    """
+    The scalar kernel, compiled to native code when numba is installed. Only
+    the routing fallback uses it, so it is compiled on first use rather than
+    at import.
+    """
+    if njit is None:
+        return _haversine_km
+    return njit(cache=True, fastmath=True)(_haversine_km)
 
 
 def _haversine_distance_km(coords1: Tuple[float, float], coords2: Tuple[float, float]) -> float:
@@ -157,21 +418,36 @@ def _haversine_distance_km(coords1: Tuple[float, float], coords2: Tuple[float, f
     Returns:
         Distance in kilometers
     """
-    lon1, lat1 = math.radians(coords1[0]), math.radians(coords1[1])
-    lon2, lat2 = math.radians(coords2[0]), math.radians(coords2[1])
-    
-    # Haversine formula
-    dlon = lon2 - lon1
-    dlat = lat2 - lat1
-    
-    a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
-    c = 2 * math.asin(math.sqrt(a))
-    
-    # Earth radius in kilometers
-    R = 6371.0
-    
-    distance_km = R * c
-    return distance_km
+    return _haversine_kernel()(
+        float(coords1[0]), float(coords1[1]), float(coords2[0]), float(coords2[1])
+    )
+
+
+def _haversine_matrix_km(
+    coords_a: List[Optional[Tuple[float, float]]],
+    coords_b: List[Optional[Tuple[float, float]]],
+) -> np.ndarray:
+    """
+    Vectorized Haversine distance for every pair of coordinates in two lists.
+    Returns an array of shape (len(coords_a), len(coords_b)) in kilometers;
+    entries where either coordinate is None are NaN.
+    """
+    def _to_radians(coords):
+        arr = np.array(
+            [c if c is not None else (np.nan, np.nan) for c in coords], dtype=np.float64
+        ).reshape(-1, 2)
+        return np.deg2rad(arr[:, 0]), np.deg2rad(arr[:, 1])
+
+    lon1, lat1 = _to_radians(coords_a)
+    lon2, lat2 = _to_radians(coords_b)
+
+    # cos(lat) is evaluated once per coordinate, not once per pair
+    cos_lat1, cos_lat2 = np.cos(lat1), np.cos(lat2)
+    sin_dlat = np.sin((lat2[None, :] - lat1[:, None]) * 0.5)
+    sin_dlon = np.sin((lon2[None, :] - lon1[:, None]) * 0.5)
+
+    a = sin_dlat * sin_dlat + np.outer(cos_lat1, cos_lat2) * sin_dlon * sin_dlon
+    return _EARTH_DIAMETER_KM * np.arctan2(np.sqrt(a), np.sqrt(1.0 - a))
 
 
 # Load cache on module import
@@ -180,6 +456,12 @@ _load_cache()
 # Initialize geocoders
 _nominatim_geolocator = Nominatim(user_agent="geo_app", timeout=10)
 
+# Nominatim's usage policy allows at most one request per second, so calls are
+# spaced out (also across concurrent runs in the same process).
+_NOMINATIM_MIN_INTERVAL = 1.0  # seconds
+_nominatim_lock = threading.Lock()
+_nominatim_last_call = 0.0
+
 # Initialize OpenCage geocoder if API key is available (fallback)
 _open_cage_api_key = os.getenv("OPEN_CAGE_DATA")
 _open_cage_geolocator = None
@@ -187,6 +469,17 @@ if _open_cage_api_key:
     _open_cage_geolocator = OpenCage(api_key=_open_cage_api_key, timeout=10)
 
 
+def _nominatim_geocode(query: str):
+    """Geocode with Nominatim, respecting its one-request-per-second policy."""
+    global _nominatim_last_call
+    with _nominatim_lock:
+        wait_time = _nominatim_last_call + _NOMINATIM_MIN_INTERVAL - time.monotonic()
+        if wait_time > 0:
+            time.sleep(wait_time)
+        _nominatim_last_call = time.monotonic()
+    return _nominatim_geolocator.geocode(query)
+
+
 def _city_to_coords(location_str: str) -> Optional[Tuple[float, float]]:
     """
     Convert a city/address string to (longitude, latitude) coordinates.
@@ -201,17 +494,16 @@ def _city_to_coords(location_str: str) -> Optional[Tuple[float, float]]:
         return None
     
     # Check cache first
-    if location_str in _location_cache:
-        coords = _location_cache[location_str]
+    cache_key = _normalize_location(location_str)
+    if cache_key in _location_cache:
+        coords = _location_cache[cache_key]
         if coords is not None:
-            print(f"Location: {location_str} (from cache)")
-            print(f"  -> Coordinates: ({coords[0]:.6f}, {coords[1]:.6f})")
+            log.debug("Location: %s (from cache) -> (%.6f, %.6f)", location_str, coords[0], coords[1])
         else:
-            print(f"Location: {location_str} (cached: failed)")
+            log.debug("Location: %s (cached: failed)", location_str)
         return coords
     
-    # Print location string
-    print(f"Location: {location_str}")
+    log.debug("Location: %s", location_str)
     
     max_retries = 10
     for attempt in range(max_retries):
@@ -219,68 +511,115 @@ def _city_to_coords(location_str: str) -> Optional[Tuple[float, float]]:
             # Try Nominatim first (free, no API key needed)
             query = location_str.encode("utf-8", errors="ignore").decode()
             query = query.replace("ü", "ue").replace("ä", "ae").replace("ö", "oe")
-            location = _nominatim_geolocator.geocode(f"{query}, Switzerland")
+            location = _nominatim_geocode(f"{query}, Switzerland")
 
             if not location:
                 # Fallback to global Nominatim search
-                location = _nominatim_geolocator.geocode(location_str)
+                location = _nominatim_geocode(location_str)
             
             if location:
                 # OpenRouteService expects (longitude, latitude)
                 coords = (location.longitude, location.latitude)
-                print(f"  -> Coordinates (Nominatim): ({coords[0]:.6f}, {coords[1]:.6f})")
+                log.debug("  -> Coordinates (Nominatim): (%.6f, %.6f)", coords[0], coords[1])
                 # Save to cache
-                _location_cache[location_str] = coords
-                _save_location_cache()
+                _cache_location(location_str, coords)
                 return coords
             else:
                 # Nominatim failed, try OpenCage as fallback if available
                 if _open_cage_geolocator is not None:
                     try:
-                        print("  Nominatim failed, trying OpenCage...")
+                        log.debug("  Nominatim failed for '%s', trying OpenCage...", location_str)
                         location = _open_cage_geolocator.geocode(f"{location_str}, Switzerland")
                         if not location:
                             location = _open_cage_geolocator.geocode(location_str)
                         
                         if location:
                             coords = (location.longitude, location.latitude)
-                            print(f"  -> Coordinates (OpenCage): ({coords[0]:.6f}, {coords[1]:.6f})")
+                            log.debug("  -> Coordinates (OpenCage): (%.6f, %.6f)", coords[0], coords[1])
                             # Save to cache
-                            _location_cache[location_str] = coords
-                            _save_location_cache()
+                            _cache_location(location_str, coords)
                             return coords
                     except Exception as oc_e:
-                        print(f"  OpenCage geocoding failed: {oc_e}")
+                        log.warning("OpenCage geocoding failed for '%s': %s", location_str, oc_e)
                 
                 # If both geocoding attempts returned None, retry if we have attempts left
                 if attempt < max_retries - 1:
                     wait_time = 0.5 * (attempt + 1)
-                    print(f"  Geocoding returned None (attempt {attempt + 1}/{max_retries}) for '{location_str}', retrying in {wait_time:.1f}s...")
+                    log.info(
+                        "Geocoding returned None (attempt %d/%d) for '%s', retrying in %.1fs...",
+                        attempt + 1, max_retries, location_str, wait_time,
+                    )
                     time.sleep(wait_time)
                     continue
                 else:
-                    print(f"  -> Geocoding failed after {max_retries} attempts for '{location_str}': location not found")
+                    log.warning("Geocoding failed after %d attempts for '%s': location not found", max_retries, location_str)
                     # Cache the failure (None) to avoid retrying
-                    _location_cache[location_str] = None
-                    _save_location_cache()
+                    _cache_location(location_str, None)
                     return None
         except Exception as e:
             if attempt < max_retries - 1:
                 # Wait a bit before retrying (exponential backoff)
                 wait_time = 0.5 * (attempt + 1)
-                print(f"  Geocoding exception (attempt {attempt + 1}/{max_retries}) for '{location_str}', retrying in {wait_time:.1f}s...")
+                log.info(
+                    "Geocoding exception (attempt %d/%d) for '%s', retrying in %.1fs...",
+                    attempt + 1, max_retries, location_str, wait_time,
+                )
                 time.sleep(wait_time)
                 continue
             else:
-                print(f"  -> Geocoding failed after {max_retries} attempts for '{location_str}': {e}")
+                log.warning("Geocoding failed after %d attempts for '%s': %s", max_retries, location_str, e)
                 # Cache the failure (None) to avoid retrying
-                _location_cache[location_str] = None
-                _save_location_cache()
+                _cache_location(location_str, None)
                 return None
     
     return None
 
 
+def _geocode_all(locations: List[str]) -> Dict[str, Optional[Tuple[float, float]]]:
+    """
+    Geocode each distinct location string once; returns a mapping from location
+    to coordinates. Locations are resolved one after another: every Nominatim
+    call waits for its one-request-per-second slot, so threads would not help.
+    """
+    # One representative string per normalized location
+    unique_locations: Dict[str, str] = {}
+    for location in locations:
+        unique_locations.setdefault(_normalize_location(location), location)
+
+    resolved = {key: _city_to_coords(location) for key, location in unique_locations.items()}
+    return {location: resolved[_normalize_location(location)] for location in locations}
+
+
+@lru_cache(maxsize=4)
+def _get_ors_client(api_key: str) -> openrouteservice.Client:
+    """
+    Return a shared OpenRouteService client per API key. The client keeps a
+    requests.Session, so connections are reused across calls and runs.
+    """
+    return openrouteservice.Client(key=api_key)
+
+
+def _retry_after_seconds(response: Any) -> Optional[float]:
+    """Parse a Retry-After header (delay in seconds or HTTP date), if present."""
+    headers = getattr(response, "headers", None)
+    value = headers.get("Retry-After") if headers else None
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
 def _driving_distance_km(
     coords1: Optional[Tuple[float, float]],
     coords2: Optional[Tuple[float, float]],
@@ -293,7 +632,8 @@ def _driving_distance_km(
     Returns None if calculation fails after retries or either coordinate is None.
     Retries up to 10 times on failure.
     Enforces rate limit of 40 requests/minute.
-    If API keeps failing, retry delay increases to 1 minute after 3 failures.
+    Retries wait for the server's Retry-After header when present, otherwise
+    use capped exponential backoff with jitter.
     """
     if coords1 is None or coords2 is None:
         return None
@@ -305,13 +645,22 @@ def _driving_distance_km(
     consecutive_failures = 0
     
     # Check cache first
+    _load_distance_cache()
     cache_key = _cache_key_for_coords(coords1, coords2)
     if cache_key in _distance_cache:
         distance_km = _distance_cache[cache_key]
-        pair_info = ""
-        if mentee_id is not None and mentor_id is not None:
-            pair_info = f" (Mentee {mentee_id} <-> Mentor {mentor_id})"
-        print(f"Distance: {distance_km:.2f} km{pair_info} (from cache)")
+        log.debug("Distance: %.2f km (Mentee %s <-> Mentor %s) (from cache)", distance_km, mentee_id, mentor_id)
+        return distance_km
+    
+    def _fallback(reason: str) -> float:
+        """Log why the route was unusable and cache the Haversine distance instead."""
+        log.warning("%s. Falling back to Haversine (straight-line) distance calculation", reason)
+        distance_km = _haversine_distance_km(coords1, coords2)
+        log.debug(
+            "Distance (Haversine fallback): %.2f km (Mentee %s <-> Mentor %s)",
+            distance_km, mentee_id, mentor_id,
+        )
+        _cache_distance(cache_key, distance_km)
         return distance_km
     
     for attempt in range(max_retries):
@@ -325,113 +674,17 @@ def _driving_distance_km(
                 format="json",
             )
             
-            # Check if response structure is valid
-            if not isinstance(route, dict):
-                # Invalid response - fallback to Haversine
-                print("\nWARNING: Invalid route response type. Falling back to Haversine distance")
-                distance_km = _haversine_distance_km(coords1, coords2)
-                pair_info = ""
-                if mentee_id is not None and mentor_id is not None:
-                    pair_info = f" (Mentee {mentee_id} <-> Mentor {mentor_id})"
-                print(f"Distance (Haversine fallback): {distance_km:.2f} km{pair_info}")
-                _distance_cache[cache_key] = distance_km
-                _save_distance_cache()
-                return distance_km
-            
-            if "routes" not in route:
-                # Missing routes key - fallback to Haversine
-                print("\nWARNING: 'routes' key not found in response. Falling back to Haversine distance")
-                print(f"Available keys: {list(route.keys())}")
-                distance_km = _haversine_distance_km(coords1, coords2)
-                pair_info = ""
-                if mentee_id is not None and mentor_id is not None:
-                    pair_info = f" (Mentee {mentee_id} <-> Mentor {mentor_id})"
-                print(f"Distance (Haversine fallback): {distance_km:.2f} km{pair_info}")
-                _distance_cache[cache_key] = distance_km
-                _save_distance_cache()
-                return distance_km
-            
-            if not route["routes"]:
-                # Empty routes list - fallback to Haversine
-                print("\nWARNING: Routes list is empty. Falling back to Haversine distance")
-                distance_km = _haversine_distance_km(coords1, coords2)
-                pair_info = ""
-                if mentee_id is not None and mentor_id is not None:
-                    pair_info = f" (Mentee {mentee_id} <-> Mentor {mentor_id})"
-                print(f"Distance (Haversine fallback): {distance_km:.2f} km{pair_info}")
-                _distance_cache[cache_key] = distance_km
-                _save_distance_cache()
-                return distance_km
-            
-            route_data = route["routes"][0]
-            if not isinstance(route_data, dict):
-                # Invalid route data - fallback to Haversine
-                print("\nWARNING: Invalid route data type. Falling back to Haversine distance")
-                distance_km = _haversine_distance_km(coords1, coords2)
-                pair_info = ""
-                if mentee_id is not None and mentor_id is not None:
-                    pair_info = f" (Mentee {mentee_id} <-> Mentor {mentor_id})"
-                print(f"Distance (Haversine fallback): {distance_km:.2f} km{pair_info}")
-                _distance_cache[cache_key] = distance_km
-                _save_distance_cache()
-                return distance_km
-            
-            if "summary" not in route_data:
-                # Missing summary - fallback to Haversine
-                print("\nWARNING: 'summary' key not found in route. Falling back to Haversine distance")
-                print(f"Available keys: {list(route_data.keys())}")
-                distance_km = _haversine_distance_km(coords1, coords2)
-                pair_info = ""
-                if mentee_id is not None and mentor_id is not None:
-                    pair_info = f" (Mentee {mentee_id} <-> Mentor {mentor_id})"
-                print(f"Distance (Haversine fallback): {distance_km:.2f} km{pair_info}")
-                _distance_cache[cache_key] = distance_km
-                _save_distance_cache()
-                return distance_km
-            
-            summary = route_data["summary"]
-            if not isinstance(summary, dict):
-                # Invalid summary type - fallback to Haversine
-                print("\nWARNING: Invalid summary type. Falling back to Haversine distance")
-                distance_km = _haversine_distance_km(coords1, coords2)
-                pair_info = ""
-                if mentee_id is not None and mentor_id is not None:
-                    pair_info = f" (Mentee {mentee_id} <-> Mentor {mentor_id})"
-                print(f"Distance (Haversine fallback): {distance_km:.2f} km{pair_info}")
-                _distance_cache[cache_key] = distance_km
-                _save_distance_cache()
-                return distance_km
-            
-            if "distance" not in summary:
-                # API didn't return distance - fallback to Haversine (straight-line) distance
-                print("\nWARNING: 'distance' key not found in summary")
-                print(f"Summary keys: {list(summary.keys())}")
-                print("Falling back to Haversine (straight-line) distance calculation")
-                
-                distance_km = _haversine_distance_km(coords1, coords2)
-                pair_info = ""
-                if mentee_id is not None and mentor_id is not None:
-                    pair_info = f" (Mentee {mentee_id} <-> Mentor {mentor_id})"
-                print(f"Distance (Haversine fallback): {distance_km:.2f} km{pair_info}")
-                
-                # Save to cache
-                _distance_cache[cache_key] = distance_km
-                _save_distance_cache()
-                return distance_km
-            
             # Distance is in meters, convert to km
-            distance_m = summary["distance"]
+            try:
+                distance_m = route["routes"][0]["summary"]["distance"]
+            except (TypeError, KeyError, IndexError):
+                return _fallback("Unexpected route response structure")
             distance_km = distance_m / 1000.0
             
-            # Print distance for debugging
-            pair_info = ""
-            if mentee_id is not None and mentor_id is not None:
-                pair_info = f" (Mentee {mentee_id} <-> Mentor {mentor_id})"
-            print(f"Distance: {distance_km:.2f} km{pair_info}")
+            log.debug("Distance: %.2f km (Mentee %s <-> Mentor %s)", distance_km, mentee_id, mentor_id)
             
             # Save to cache
-            _distance_cache[cache_key] = distance_km
-            _save_distance_cache()
+            _cache_distance(cache_key, distance_km)
             
             # Reset consecutive failures on success
             consecutive_failures = 0
@@ -441,19 +694,8 @@ def _driving_distance_km(
             
             # If we've exhausted retries, fallback to Haversine distance
             if attempt == max_retries - 1:
-                print("\nWARNING: API call failed after all retries. Falling back to Haversine (straight-line) distance calculation")
-                distance_km = _haversine_distance_km(coords1, coords2)
-                pair_info = ""
-                if mentee_id is not None and mentor_id is not None:
-                    pair_info = f" (Mentee {mentee_id} <-> Mentor {mentor_id})"
-                print(f"Distance (Haversine fallback): {distance_km:.2f} km{pair_info}")
-                
-                # Save to cache
-                _distance_cache[cache_key] = distance_km
-                _save_distance_cache()
-                return distance_km
+                return _fallback("API call failed after all retries")
             
-            # Print detailed error information
             pair_info = ""
             if mentee_id is not None and mentor_id is not None:
                 pair_info = f" (Mentee {mentee_id} <-> Mentor {mentor_id})"
@@ -464,6 +706,7 @@ def _driving_distance_km(
             # Try to extract HTTP status code and response details if available
             status_code = None
             response_body = None
+            retry_after = _retry_after_seconds(getattr(e, 'response', None))
             
             # Check if it's an HTTP error from openrouteservice (usually wraps requests exceptions)
             if hasattr(e, 'response'):
@@ -484,8 +727,6 @@ def _driving_distance_km(
             # OpenRouteService ApiError sometimes has status code in the error message
             # Format: "403 ({'error': '...'})" or similar
             if status_code is None:
-                import re
-                import ast
                 status_match = re.search(r'^(\d{3})\s*\(', error_msg)
                 if status_match:
                     status_code = int(status_match.group(1))
@@ -505,62 +746,181 @@ def _driving_distance_km(
                     except Exception:
                         pass
             
-            # Print detailed error
-            print(f"\n{'='*60}")
-            print(f"API ERROR{pair_info}:")
-            print(f"  Error Type: {error_type}")
-            print(f"  Error Message: {error_msg}")
+            # Log detailed error
+            details = [f"API error{pair_info}", f"type={error_type}", f"message={error_msg}"]
             if status_code is not None:
-                print(f"  HTTP Status Code: {status_code}")
+                details.append(f"status={status_code}")
             if response_body:
                 # Limit response body length to avoid too much output
-                body_preview = response_body[:500] if len(response_body) > 500 else response_body
-                print(f"  Response Body: {body_preview}")
+                details.append(f"body={response_body[:500]}")
                 if len(response_body) > 500:
-                    print(f"  ... (truncated, total length: {len(response_body)} chars)")
-            print(f"{'='*60}\n")
+                    details.append(f"(body truncated, total length: {len(response_body)} chars)")
+            log.warning("; ".join(details))
             
             # Fail immediately on authentication/authorization errors (401, 403)
             # These won't resolve with retries
             if status_code in (401, 403):
-                print(f"ERROR: Authentication/Authorization failed (HTTP {status_code}).")
-                print("This error will not resolve with retries. Please check:")
-                print("  - API key is valid and active")
-                print("  - API key has permissions for directions endpoint")
-                print("  - Account billing/limits are not exceeded")
-                print("Skipping this distance calculation.\n")
+                log.error(
+                    "Authentication/Authorization failed (HTTP %s), which will not resolve with retries. "
+                    "Check that the API key is valid and active, has permissions for the directions "
+                    "endpoint, and that account billing/limits are not exceeded. "
+                    "Skipping this distance calculation.",
+                    status_code,
+                )
                 return None
             
             # Also fail fast on 429 (rate limit) if we're already being rate limited
-            if status_code == 429 and consecutive_failures >= 3:
-                print("ERROR: Rate limit exceeded (HTTP 429) after multiple attempts.")
-                print("Skipping this distance calculation to avoid further rate limiting.\n")
+            # and the server did not tell us how long to wait
+            if status_code == 429 and retry_after is None and consecutive_failures >= 3:
+                log.error(
+                    "Rate limit exceeded (HTTP 429) after multiple attempts. "
+                    "Skipping this distance calculation to avoid further rate limiting."
+                )
                 return None
             
             if attempt < max_retries - 1:
-                # If we've had 3+ consecutive failures, use 1 minute delay
-                if consecutive_failures >= 3:
-                    wait_time = 60.0  # 1 minute
-                    print(f"API call failed ({consecutive_failures} consecutive failures) (attempt {attempt + 1}/{max_retries}), retrying in {wait_time:.0f}s...")
+                if retry_after is not None:
+                    # Server told us exactly how long to back off
+                    wait_time = retry_after
                 else:
-                    # Use exponential backoff for first few failures
-                    wait_time = 0.5 * (attempt + 1)
-                    print(f"API call failed (attempt {attempt + 1}/{max_retries}), retrying in {wait_time:.1f}s...")
+                    # Exponential backoff with jitter, capped after the jitter
+                    wait_time = min(_RETRY_MAX_WAIT, 0.5 * 2 ** attempt * (0.5 + random.random()))
+                log.info("API call failed (attempt %d/%d), retrying in %.1fs...", attempt + 1, max_retries, wait_time)
                 time.sleep(wait_time)
                 continue
             else:
-                print(f"Distance calculation failed after {max_retries} attempts{pair_info}")
+                log.warning("Distance calculation failed after %d attempts%s", max_retries, pair_info)
                 return None
     
     return None
 
 
+def _index_unique_coords(
+    coords: List[Optional[Tuple[float, float]]],
+    ids: List[Any],
+) -> Tuple[List[Tuple[float, float]], List[Any], np.ndarray]:
+    """
+    Deduplicate coordinates (by quantized key).
+    Returns the unique coordinates, the first id seen at each of them (for log
+    messages) and, per input entry, the index of its unique coordinate. Missing
+    coordinates map to index len(unique_coords).
+    """
+    positions: Dict[_CoordKey, int] = {}
+    unique_coords: List[Tuple[float, float]] = []
+    representative_ids: List[Any] = []
+    index: List[int] = []
+    for coord, item_id in zip(coords, ids):
+        if coord is None:
+            index.append(-1)
+            continue
+        key = _quantize_coords(coord)
+        if key not in positions:
+            positions[key] = len(unique_coords)
+            unique_coords.append(coord)
+            representative_ids.append(item_id)
+        index.append(positions[key])
+
+    index_arr = np.array(index, dtype=np.intp)
+    index_arr[index_arr < 0] = len(unique_coords)
+    return unique_coords, representative_ids, index_arr
+
+
+def _first_positions(coords: List[Optional[Tuple[float, float]]]) -> List[int]:
+    """Index of the first occurrence of each distinct (quantized) coordinate, skipping missing ones."""
+    positions: Dict[_CoordKey, int] = {}
+    for i, coord in enumerate(coords):
+        if coord is not None:
+            positions.setdefault(_quantize_coords(coord), i)
+    return list(positions.values())
+
+
+def _prefetch_driving_distances(
+    coords_a: List[Optional[Tuple[float, float]]],
+    coords_b: List[Optional[Tuple[float, float]]],
+    ors_client: openrouteservice.Client,
+    max_distance_km: Optional[float] = None,
+    straight_km: Optional[np.ndarray] = None,
+) -> None:
+    """
+    Fill the distance cache for all uncached pairs between two coordinate lists
+    using the OpenRouteService matrix endpoint (one request per chunk of sources
+    instead of one directions request per pair). Pairs the matrix cannot resolve
+    are left uncached so the per-pair path can still handle them.
+    If max_distance_km is given, pairs whose straight-line distance already
+    exceeds it are not requested (driving distance is never shorter).
+    straight_km is the Haversine matrix for coords_a x coords_b, when the caller
+    already has it; otherwise it is computed here.
+    """
+    _load_distance_cache()
+    source_rows = _first_positions(coords_a)
+    destination_cols = _first_positions(coords_b)
+    sources = [coords_a[i] for i in source_rows]
+    destinations = [coords_b[j] for j in destination_cols]
+    if not sources or not destinations:
+        return
+
+    if max_distance_km is None:
+        candidates = np.ones((len(sources), len(destinations)), dtype=bool)
+    else:
+        if straight_km is None:
+            straight_km = _haversine_matrix_km(sources, destinations)
+        else:
+            straight_km = straight_km[np.ix_(source_rows, destination_cols)]
+        candidates = straight_km < max_distance_km
+
+    needed = {
+        (si, di)
+        for si, di in np.argwhere(candidates).tolist()
+        if _cache_key_for_coords(sources[si], destinations[di]) not in _distance_cache
+    }
+
+    # Only request sources/destinations that take part in at least one needed pair
+    needed_sources = {si for si, _ in needed}
+    needed_destinations = {di for _, di in needed}
+    sources = [src for si, src in enumerate(sources) if si in needed_sources]
+    destinations = [dst for di, dst in enumerate(destinations) if di in needed_destinations]
+    if not sources or not destinations:
+        return
+
+    chunk_size = max(1, _ORS_MATRIX_MAX_ROUTES // len(destinations))
+    for start in range(0, len(sources), chunk_size):
+        chunk = sources[start:start + chunk_size]
+        try:
+            _wait_for_rate_limit()
+            matrix = ors_client.distance_matrix(
+                locations=[list(c) for c in chunk + destinations],
+                sources=list(range(len(chunk))),
+                destinations=list(range(len(chunk), len(chunk) + len(destinations))),
+                profile="driving-car",
+                metrics=["distance"],
+            )
+            rows = matrix["distances"]
+        except Exception as e:
+            log.warning("Distance matrix request failed, falling back to per-pair routing: %s", e)
+            continue
+
+        for src, row in zip(chunk, rows):
+            for dst, distance_m in zip(destinations, row):
+                if distance_m is not None:
+                    _cache_distance(_cache_key_for_coords(src, dst), distance_m / 1000.0)
+
+    log.info("Distance matrix prefetched for %d origins x %d destinations", len(sources), len(destinations))
+
+
+def _column_as_stripped_str(df: pd.DataFrame, col: str) -> List[str]:
+    """Column values as stripped strings (empty strings if the column is missing)."""
+    if col not in df.columns:
+        return [""] * len(df)
+    return [str(value).strip() for value in df[col].tolist()]
+
+
 def geographic_proximity_results(
     mentees_df: pd.DataFrame,
     mentors_df: pd.DataFrame,
     importance_modifier: float = 1.0,
     geographic_max_distance: Optional[int] = 200,
     ors_api_key: Optional[str] = None,
+    straight_line_fallback: bool = False,
 ) -> Dict[Tuple[int, int], Dict[str, Any]]:
     """
     Compute geographic proximity between mentees and mentors.
@@ -573,6 +933,8 @@ def geographic_proximity_results(
       where max_reasonable_distance is geographic_max_distance (default 200 km); 
       distances at or above this threshold receive the minimum score of 0.0.
     - If a location is unmapped or a distance is missing, the score defaults to 0.0 for that pair.
+      With straight_line_fallback=True, a missing distance between two mapped locations is
+      replaced by the Haversine (straight-line) distance.
     - All scores are multiplied by importance_modifier (default 1.0) and fall in the range [0, 1].
     - The result is a dictionary mapping (mentee_id, mentor_id) to float scores.
     """
@@ -587,105 +949,120 @@ def geographic_proximity_results(
     ors_client = None
     if api_key:
         try:
-            ors_client = openrouteservice.Client(key=api_key)
+            ors_client = _get_ors_client(api_key)
         except Exception as e:
-            print(f"⚠️ Warning: Could not initialize OpenRouteService client: {e}")
+            log.warning("Could not initialize OpenRouteService client: %s", e)
     else:
-        print("⚠️ No OPEN_ROUTE_SERVICE key found in .env, skipping API routing.")
+        log.warning("No OPEN_ROUTE_SERVICE key found in .env, skipping API routing")
         ors_client = None
 
+    # --- Extract the needed columns once ---
+    mentee_ids = mentees_df[mentee_id_col].tolist()
+    mentor_ids = mentors_df[mentor_id_col].tolist()
+    mentee_cities = _column_as_stripped_str(mentees_df, mentee_city_col)
+    mentor_cities = _column_as_stripped_str(mentors_df, mentor_address_col)
+
     # --- Precompute coordinates for all locations ---
-    print("\n=== MENTEE LOCATIONS ===")
-    mentee_coords, mentee_cities = [], []
-    for _, row in mentees_df.iterrows():
-        city = str(row.get(mentee_city_col, "")).strip()
-        mentee_id = row.get(mentee_id_col, None)
-        print(f"\n[Mentee {mentee_id}]")
-        coords = _city_to_coords(city)
-        mentee_coords.append(coords)
-        mentee_cities.append(city)
-
-    print("\n=== MENTOR LOCATIONS ===")
-    mentor_coords, mentor_cities = [], []
-    for _, row in mentors_df.iterrows():
-        address = str(row.get(mentor_address_col, "")).strip()
-        mentor_id = row.get(mentor_id_col, None)
-        print(f"\n[Mentor {mentor_id}]")
-        coords = _city_to_coords(address)
-        mentor_coords.append(coords)
-        mentor_cities.append(address)
+
+    log.info("Geocoding locations")
+    location_coords = _geocode_all(mentee_cities + mentor_cities)
+    mentee_coords = [location_coords[city] for city in mentee_cities]
+    mentor_coords = [location_coords[address] for address in mentor_cities]
+
+    log.debug("=== MENTEE LOCATIONS ===")
+    for mentee_id, city, coords in zip(mentee_ids, mentee_cities, mentee_coords):
+        log.debug("[Mentee %s] %s -> %s", mentee_id, city, coords)
+
+    log.debug("=== MENTOR LOCATIONS ===")
+    for mentor_id, address, coords in zip(mentor_ids, mentor_cities, mentor_coords):
+        log.debug("[Mentor %s] %s -> %s", mentor_id, address, coords)
+
+    # Use geographic_max_distance if provided, otherwise default to 200 km
+    max_distance = geographic_max_distance if geographic_max_distance is not None else 200
+    
+    if max_distance <= 0:
+        log.warning("geographic_max_distance must be positive, using default 200 km")
+        max_distance = 200
+    
+    log.info("Using maximum distance threshold: %s km", max_distance)
 
     # --- Compute distances ---
-    print("\n=== CALCULATING DISTANCES ===")
-    all_distances: list[float] = []
+    log.info("Calculating distances")
 
-    for mentee_idx, mentee_row in mentees_df.iterrows():
-        mentee_coord = mentee_coords[mentee_idx]
-        mentee_id = mentee_row[mentee_id_col]
+    # Many participants share a location: compute each distinct
+    # (mentee location, mentor location) pair once and expand afterwards.
+    unique_mentee_coords, mentee_reps, mentee_idx = _index_unique_coords(mentee_coords, mentee_ids)
+    unique_mentor_coords, mentor_reps, mentor_idx = _index_unique_coords(mentor_coords, mentor_ids)
+    _load_distance_cache()
 
-        for mentor_idx, mentor_row in mentors_df.iterrows():
-            mentor_coord = mentor_coords[mentor_idx]
-            mentor_id = mentor_row[mentor_id_col]
+    # Straight-line distances for all pairs at once; used to skip routing for
+    # pairs already beyond max_distance and, with straight_line_fallback, for
+    # pairs that still have no driving distance.
+    haversine = _haversine_matrix_km(unique_mentee_coords, unique_mentor_coords)
 
-            if mentee_coord is None or mentor_coord is None:
-                continue
+    if ors_client is not None:
+        _prefetch_driving_distances(
+            unique_mentee_coords, unique_mentor_coords, ors_client, max_distance, straight_km=haversine
+        )
 
+    # The extra last row/column stays NaN and stands in for missing coordinates
+    unique_distances = np.full((len(unique_mentee_coords) + 1, len(unique_mentor_coords) + 1), np.nan)
+
+    for i, (mentee_coord, mentee_id) in enumerate(zip(unique_mentee_coords, mentee_reps)):
+        for j, (mentor_coord, mentor_id) in enumerate(zip(unique_mentor_coords, mentor_reps)):
             cache_key = _cache_key_for_coords(mentee_coord, mentor_coord)
             dist = _distance_cache.get(cache_key)
 
-            if dist is None:
+            if dist is None and haversine[i, j] >= max_distance:
+                # Driving distance is never shorter than the straight line, so the
+                # pair scores 0 either way and the routing API is not asked.
+                dist = haversine[i, j]
+            elif dist is None and ors_client is not None:
                 dist = _driving_distance_km(
                     mentee_coord, mentor_coord, ors_client, mentee_id, mentor_id
                 )
 
-            if dist is not None and math.isfinite(dist):
-                all_distances.append(dist)
+            if dist is None and straight_line_fallback:
+                dist = haversine[i, j]
 
-    # Use geographic_max_distance if provided, otherwise default to 200 km
-    max_distance = geographic_max_distance if geographic_max_distance is not None else 200
-    
-    if max_distance <= 0:
-        print("⚠️ Warning: geographic_max_distance must be positive, using default 200 km")
-        max_distance = 200
-    
-    print(f"\nUsing maximum distance threshold: {max_distance} km")
-    
-    if not all_distances:
-        print("⚠️ No valid distances found.")
+            unique_distances[i, j] = dist
+
+    distances = unique_distances[np.ix_(mentee_idx, mentor_idx)]
+
+    _flush_caches()
+
+    valid = np.isfinite(distances)
+    all_distances = distances[valid]
+    if all_distances.size == 0:
+        log.warning("No valid distances found")
         return {}
 
-    # Print distance statistics for reference
-    min_dist, max_dist = min(all_distances), max(all_distances)
-    print(f"Distance statistics: min={min_dist:.2f} km, max={max_dist:.2f} km")
+    # Log distance statistics for reference
+    min_dist, max_dist = all_distances.min(), all_distances.max()
+    log.info("Distance statistics: min=%.2f km, max=%.2f km", min_dist, max_dist)
 
     # --- Compute scores using geographic_max_distance ---
-    results: Dict[Tuple[int, int], Dict[str, Any]] = {}
-    for mentee_idx, mentee_row in mentees_df.iterrows():
-        mentee_id = mentee_row[mentee_id_col]
-        mentee_coord = mentee_coords[mentee_idx]
-        mentee_city = mentee_cities[mentee_idx]
-
-        for mentor_idx, mentor_row in mentors_df.iterrows():
-            mentor_id = mentor_row[mentor_id_col]
-            mentor_coord = mentor_coords[mentor_idx]
-            mentor_city = mentor_cities[mentor_idx]
-
-            score = 0.0
-            if mentee_coord and mentor_coord:
-                cache_key = _cache_key_for_coords(mentee_coord, mentor_coord)
-                dist = _distance_cache.get(cache_key)
-                if dist is not None and math.isfinite(dist):
-                    # Score formula: max(0.0, 1.0 - (distance_km / max_reasonable_distance))
-                    # distance = 0 -> score = 1.0
-                    # distance = max_distance -> score = 0.0
-                    # distance > max_distance -> score = 0.0 (from max())
-                    score = max(0.0, 1.0 - (dist / max_distance))
-
-            results[(mentee_id, mentor_id)] = {
-                "distance_score": round(score * importance_modifier, 3),
-                "mentee_city": mentee_city or "unknown",
-                "mentor_city": mentor_city or "unknown",
-            }
-
-    print(f"\n✅ Geographic proximity computed for {len(results)} mentor–mentee pairs.")
+    # Score formula: max(0.0, 1.0 - (distance_km / max_reasonable_distance))
+    # distance = 0 -> score = 1.0
+    # distance >= max_distance -> score = 0.0
+    # missing distance -> score = 0.0
+    # Computed in place on a single buffer instead of one temporary per step
+    scores = np.divide(distances, max_distance)
+    np.subtract(1.0, scores, out=scores)
+    np.maximum(scores, 0.0, out=scores)
+    scores[~valid] = 0.0
+    scores *= importance_modifier
+    score_rows = scores.tolist()
+
+    results: Dict[Tuple[int, int], Dict[str, Any]] = {
+        (mentee_id, mentor_id): {
+            "distance_score": round(score_rows[i][j], 3),
+            "mentee_city": mentee_city or "unknown",
+            "mentor_city": mentor_city or "unknown",
+        }
+        for i, (mentee_id, mentee_city) in enumerate(zip(mentee_ids, mentee_cities))
+        for j, (mentor_id, mentor_city) in enumerate(zip(mentor_ids, mentor_cities))
+    }
+
+    log.info("Geographic proximity computed for %d mentor-mentee pairs", len(results))
     return results
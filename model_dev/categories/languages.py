@@ -1,33 +1,76 @@
+import logging
 import re
-import pandas as pd
+import sys
+from functools import lru_cache
+
 from typing import Any, Dict, Tuple
 
+import numpy as np
+import pandas as pd
+
+log = logging.getLogger(__name__)
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
 
 # ============================================================
 # CEFR Level Conversion Utilities
 # ============================================================
 
+_CEFR_SCORES = {"A1": 0.2, "A2": 0.4, "B1": 0.6, "B2": 0.75, "C1": 0.9, "C2": 1.0}
+_CEFR_RE = re.compile(r"\b(A1|A2|B1|B2|C1|C2)\b")
+_NON_LEVEL_CHARS_RE = re.compile(r"[^A-Z0-9/ ]")
+_TOKEN_RE = re.compile(r"[A-Za-zÀ-ÿ]+")
+# Words in 'Other language' fields that are not language names; never reported
+# as the common language when a real language name is shared as well
+_FILLER_TOKENS = frozenset({
+    "and", "und", "et", "or", "oder", "with", "mit", "also", "auch", "only", "nur",
+    "some", "basic", "basics", "good", "very", "sehr", "gut", "gute", "fluent",
+    "native", "language", "languages", "sprache", "sprachen", "muttersprache",
+    "mother", "tongue", "level", "kenntnisse", "spoken", "written", "mündlich",
+    "schriftlich", "second", "zweite", "nan", "none", "keine",
+})
+
+# Per-pair common language codes: 0 German, 1 English, 2 shared other language
+_OTHER = 2
+_NO_COMMON = 3
+
+
+@lru_cache(maxsize=1024)
 def _level_to_score(level: str) -> float:
     """
     Convert CEFR level (A1–C2, Native) or text field into a numeric score.
     Handles variations such as "Muttersprache / Native language" or mixed text.
+    If several levels are mentioned, the lowest one counts.
     """
     if not isinstance(level, str):
         return 0.0
 
-    level = level.upper().strip()
-    level = re.sub(r"[^A-Z0-9/ ]", " ", level)
+    level = _NON_LEVEL_CHARS_RE.sub(" ", level.upper().strip())
 
-    mapping = {"A1": 0.2, "A2": 0.4, "B1": 0.6, "B2": 0.75, "C1": 0.9, "C2": 1.0}
-    for k, v in mapping.items():
-        if re.search(rf"\b{k}\b", level):
-            return v
+    levels = _CEFR_RE.findall(level)
+    if levels:
+        return min(_CEFR_SCORES[k] for k in levels)
 
     if "NATIVE" in level or "MUTTERSPRACHE" in level:
         return 1.0
     return 0.0
 
 
+def _levels_to_scores(levels: list) -> np.ndarray:
+    """
+    Vectorized _level_to_score: the column is encoded as a categorical, each
+    category is scored once and the codes index into that lookup table.
+    """
+    levels = pd.Categorical(levels)
+    table = np.array([_level_to_score(level) for level in levels.categories], dtype=np.float64)
+    return table[levels.codes]
+
+
 def _score_to_label(value: float) -> str:
     """
     Convert a numeric score back to a CEFR label for readability.
@@ -48,23 +91,147 @@ def _score_to_label(value: float) -> str:
         return "Below A1"
 
 
+@lru_cache(maxsize=4096)
+def _language_tokens(text: str) -> tuple:
+    """
+    Split an 'Other language' free-text field into lowercase word tokens
+    (each token once, in order of appearance).
+    """
+    if not text:
+        return ()
+    return tuple(dict.fromkeys(_TOKEN_RE.findall(text.lower())))
+
+
+def _shared_tokens_language(tokens1: tuple, tokens2: tuple) -> str | None:
+    """
+    Return the shared language name for two token lists, or None if no overlap.
+    With several shared tokens the first one in tokens1 (the mentee's own order)
+    that is a language name rather than a filler word is used.
+    """
+    common = [token for token in tokens1 if token in tokens2]
+    if common:
+        language = next(
+            (token for token in common if len(token) > 2 and token not in _FILLER_TOKENS), common[0]
+        )
+        # Interned so every pair sharing this language references one string
+        return sys.intern(language.capitalize())
+    return None
+
+
 def _shared_other_language(text1: str, text2: str) -> str | None:
     """
     Detect a common 'Other language' between two participants using regex.
     Returns the shared language name or None if no overlap.
     """
-    if not text1 or not text2:
-        return None
+    return _shared_tokens_language(_language_tokens(text1), _language_tokens(text2))
 
-    set1 = set(re.findall(r"[A-Za-zÀ-ÿ]+", text1.lower()))
-    set2 = set(re.findall(r"[A-Za-zÀ-ÿ]+", text2.lower()))
-    common = set1.intersection(set2)
 
-    if len(common) > 0:
-        return list(common)[0].capitalize()
+def _find_col(df: pd.DataFrame, choices) -> str | None:
+    """
+    Return the first column whose name contains one of `choices` (case-insensitive),
+    trying the choices in order. Returns None if no column matches.
+    """
+    for choice in choices:
+        for col in df.columns:
+            if choice.lower() in col.lower():
+                return col
     return None
 
 
+def _column_as_str(df: pd.DataFrame, col: str | None) -> list:
+    """
+    Column values converted with str() (missing values become "nan"),
+    or empty strings when the column does not exist.
+    """
+    if col is None or col not in df.columns:
+        return [""] * len(df)
+    return [str(v) for v in df[col].tolist()]
+
+
+def _language_labels(german_strs, english_strs, other_strs, german_scores, english_scores) -> list:
+    """
+    Display dicts of each participant's raw language fields and CEFR labels.
+    """
+    return [
+        {
+            "German": f"{g or '—'} ({_score_to_label(gs)})",
+            "English": f"{e or '—'} ({_score_to_label(es)})",
+            "Other": o or "—",
+        }
+        for g, e, o, gs, es in zip(
+            german_strs, english_strs, other_strs, german_scores.tolist(), english_scores.tolist()
+        )
+    ]
+
+
+def _score_pairs(mentee_german, mentee_english, mentor_german, mentor_english, has_shared, importance_modifier):
+    """
+    Weighted language score and common-language code for every mentee x mentor pair.
+    German/English count when both sides are at least B1 (0.6); a shared
+    'Other' language counts as 0.8. Returns (weighted_total, lang_code) matrices.
+    """
+    german_ok = (mentee_german[:, None] >= 0.6) & (mentor_german[None, :] >= 0.6)
+    english_ok = (mentee_english[:, None] >= 0.6) & (mentor_english[None, :] >= 0.6)
+
+    german_eff = np.where(german_ok, (mentee_german[:, None] + mentor_german[None, :]) / 2, 0.0)
+    english_eff = np.where(english_ok, (mentee_english[:, None] + mentor_english[None, :]) / 2, 0.0)
+    other_eff = np.where(has_shared, 0.8, 0.0)
+
+    # Best language per pair; argmax keeps the first maximum, so ties
+    # prefer German, then English, then the shared other language
+    best = np.stack([german_eff, english_eff, other_eff], axis=-1)
+    lang_code = best.argmax(axis=-1).astype(np.int8)
+    # If no sufficient proficiency found
+    lang_code[best.max(axis=-1) < 0.6] = _NO_COMMON
+
+    # Weighted total score (balance between German and English)
+    weighted_total = (
+        0.45 * german_eff + 0.45 * english_eff + np.where(has_shared, 0.10, 0.0)
+    ) * importance_modifier
+    return weighted_total, lang_code
+
+
+def _score_pairs_kernel(mentee_german, mentee_english, mentor_german, mentor_english, has_shared, importance_modifier):
+    """
+    Same as _score_pairs as one fused loop, parallel over mentees (compiled with numba).
+    """
+    n_mentees, n_mentors = has_shared.shape
+    weighted_total = np.empty((n_mentees, n_mentors), dtype=np.float64)
+    lang_code = np.empty((n_mentees, n_mentors), dtype=np.int8)
+    for i in prange(n_mentees):
+        for j in range(n_mentors):
+            german_eff = 0.0
+            if mentee_german[i] >= 0.6 and mentor_german[j] >= 0.6:
+                german_eff = (mentee_german[i] + mentor_german[j]) / 2
+            english_eff = 0.0
+            if mentee_english[i] >= 0.6 and mentor_english[j] >= 0.6:
+                english_eff = (mentee_english[i] + mentor_english[j]) / 2
+            other_eff = 0.8 if has_shared[i, j] else 0.0
+
+            best_score = german_eff
+            code = 0
+            if english_eff > best_score:
+                best_score = english_eff
+                code = 1
+            if other_eff > best_score:
+                best_score = other_eff
+                code = _OTHER
+            lang_code[i, j] = _NO_COMMON if best_score < 0.6 else code
+
+            weighted_total[i, j] = (
+                0.45 * german_eff + 0.45 * english_eff + (0.10 if has_shared[i, j] else 0.0)
+            ) * importance_modifier
+    return weighted_total, lang_code
+
+
+# Use the compiled, parallel kernel when numba is installed
+if njit is not None:
+    _score_pairs = njit(parallel=True, cache=True)(_score_pairs_kernel)
+    _score_pairs(  # warm up the JIT at import
+        np.zeros(1), np.zeros(1), np.zeros(1), np.zeros(1), np.zeros((1, 1), dtype=np.bool_), 1.0
+    )
+
+
 # ============================================================
 # Main Function: Language Matching Between Mentors and Mentees
 # ============================================================
@@ -73,10 +240,14 @@ def languages_results(
     mentees_df: pd.DataFrame,
     mentors_df: pd.DataFrame,
     importance_modifier: float = 1.0,
+    include_debug_labels: bool = True,
 ) -> Dict[Tuple[int, int], Dict[str, Any]]:
     """
     Compute language compatibility between mentees and mentors
     using CEFR levels (A1–C2, Native). Returns a dictionary of pairwise results.
+    With include_debug_labels=False the per-pair "mentee_languages" /
+    "mentor_languages" display dicts are left out. Otherwise every pair of a
+    participant references the same (read-only) display dict.
     """
 
     # Normalize column names to remove trailing spaces or hidden characters
@@ -86,98 +257,112 @@ def languages_results(
     results = {}
     summary = {"German": 0, "English": 0, "Other": 0, "No common language": 0}
 
-    for _, mentee in mentees_df.iterrows():
-        mentee_id = mentee["Mentee Number"]
-
-        # ------------------------------
-        # Mentee language fields
-        # ------------------------------
-        mentee_german_str = str(mentee.get("German", ""))
-        mentee_english_str = str(mentee.get("English", ""))
-        mentee_other_str = str(mentee.get("Further language skills", ""))
-
-        mentee_german = _level_to_score(mentee_german_str)
-        mentee_english = _level_to_score(mentee_english_str)
-
-        for _, mentor in mentors_df.iterrows():
-            mentor_id = mentor["Mentor Number"]
-
-            # ------------------------------
-            # Mentor language fields
-            # (find by partial match to handle variations and trailing spaces)
-            # ------------------------------
-            mentor_series = {k.strip(): str(v) for k, v in mentor.items()}
-
-            def _get_col(choices):
-                for choice in choices:
-                    for col in mentor_series.keys():
-                        if choice.lower() in col.lower():
-                            return mentor_series[col]
-                return ""
-
-            mentor_german_str = _get_col(["Deutsch", "German"])
-            mentor_english_str = _get_col(["Englisch", "English"])
-            mentor_other_str = _get_col(["Weitere", "Other"])
-
-            mentor_german = _level_to_score(mentor_german_str)
-            mentor_english = _level_to_score(mentor_english_str)
-
-            # ------------------------------
-            # Shared 'Other' language
-            # ------------------------------
-            shared_other = _shared_other_language(mentee_other_str, mentor_other_str)
-
-            # ------------------------------
-            # Mutual language compatibility
-            # ------------------------------
-            german_ok = mentee_german >= 0.6 and mentor_german >= 0.6
-            english_ok = mentee_english >= 0.6 and mentor_english >= 0.6
-
-            german_eff = (mentee_german + mentor_german) / 2 if german_ok else 0.0
-            english_eff = (mentee_english + mentor_english) / 2 if english_ok else 0.0
-            other_eff = 0.8 if shared_other else 0.0
-
-            langs = {"German": german_eff, "English": english_eff}
-            if shared_other:
-                langs[shared_other] = other_eff
-
-            best_lang, best_score = max(langs.items(), key=lambda x: x[1])
-
-            # Weighted total score (balance between German and English)
-            weighted_total = (
-                0.45 * german_eff + 0.45 * english_eff + (0.10 if shared_other else 0)
-            ) * importance_modifier
+    # ------------------------------
+    # Extract the language columns once
+    # (mentor columns found by partial match to handle variations and trailing spaces)
+    # ------------------------------
+    mentee_ids = mentees_df["Mentee Number"].tolist()
+    mentee_german_strs = _column_as_str(mentees_df, "German")
+    mentee_english_strs = _column_as_str(mentees_df, "English")
+    mentee_other_strs = _column_as_str(mentees_df, "Further language skills")
+
+    mentor_ids = mentors_df["Mentor Number"].tolist()
+    mentor_german_strs = _column_as_str(mentors_df, _find_col(mentors_df, ["Deutsch", "German"]))
+    mentor_english_strs = _column_as_str(mentors_df, _find_col(mentors_df, ["Englisch", "English"]))
+    mentor_other_strs = _column_as_str(mentors_df, _find_col(mentors_df, ["Weitere", "Other"]))
+
+    # CEFR scores are converted once per participant instead of once per pair
+    mentee_german = _levels_to_scores(mentee_german_strs)
+    mentee_english = _levels_to_scores(mentee_english_strs)
+    mentor_german = _levels_to_scores(mentor_german_strs)
+    mentor_english = _levels_to_scores(mentor_english_strs)
 
-            # If no sufficient proficiency found
-            if best_score < 0.6:
-                best_lang = "No common language"
+    # ------------------------------
+    # Shared 'Other' language
+    # ------------------------------
+    # Tokenize each participant once, then use a token -> mentors index to
+    # find the overlapping pairs without intersecting every pair
+    mentee_tokens = [_language_tokens(text) for text in mentee_other_strs]
+    mentor_tokens = [_language_tokens(text) for text in mentor_other_strs]
+
+    mentors_by_token: Dict[str, list] = {}
+    for j, tokens in enumerate(mentor_tokens):
+        for token in tokens:
+            mentors_by_token.setdefault(token, []).append(j)
+
+    has_shared = np.zeros((len(mentee_ids), len(mentor_ids)), dtype=bool)
+    for i, tokens in enumerate(mentee_tokens):
+        for token in tokens:
+            has_shared[i, mentors_by_token.get(token, [])] = True
+
+    shared_other: Dict[Tuple[int, int], str] = {
+        (i, j): _shared_tokens_language(mentee_tokens[i], mentor_tokens[j])
+        for i, j in np.argwhere(has_shared).tolist()
+    }
+
+    # ------------------------------
+    # Mutual language compatibility (mentees x mentors matrices)
+    # ------------------------------
+    weighted_total, lang_code = _score_pairs(
+        mentee_german, mentee_english, mentor_german, mentor_english, has_shared, importance_modifier
+    )
+    weighted_total = weighted_total.tolist()
+
+    # Display labels are formatted once per participant
+    if include_debug_labels:
+        mentee_labels = _language_labels(
+            mentee_german_strs, mentee_english_strs, mentee_other_strs, mentee_german, mentee_english
+        )
+        mentor_labels = _language_labels(
+            mentor_german_strs, mentor_english_strs, mentor_other_strs, mentor_german, mentor_english
+        )
+
+    lang_labels = ("German", "English", None, "No common language")
+    lang_codes = lang_code.tolist()
+
+    # Pairs without a common language always score 0 (every effective score
+    # is 0), so their entry is copied from a template instead of rebuilt
+    no_common_entry = {
+        "score": round(0.0 * importance_modifier, 3),
+        "common_language": "No common language",
+    }
+
+    for i, mentee_id in enumerate(mentee_ids):
+        for j, mentor_id in enumerate(mentor_ids):
+            code = lang_codes[i][j]
 
             # Store results
-            results[(mentee_id, mentor_id)] = {
-                "score": round(weighted_total, 3),
-                "common_language": best_lang,
-                "mentee_languages": {
-                    "German": f"{mentee_german_str or '—'} ({_score_to_label(mentee_german)})",
-                    "English": f"{mentee_english_str or '—'} ({_score_to_label(mentee_english)})",
-                    "Other": mentee_other_str or "—",
-                },
-                "mentor_languages": {
-                    "German": f"{mentor_german_str or '—'} ({_score_to_label(mentor_german)})",
-                    "English": f"{mentor_english_str or '—'} ({_score_to_label(mentor_english)})",
-                    "Other": mentor_other_str or "—",
-                },
-            }
-
-            summary[best_lang] = summary.get(best_lang, 0) + 1
+            if code == _NO_COMMON:
+                entry = no_common_entry.copy()
+            else:
+                entry = {
+                    "score": round(weighted_total[i][j], 3),
+                    "common_language": shared_other[i, j] if code == _OTHER else lang_labels[code],
+                }
+            if include_debug_labels:
+                # One display dict per participant, referenced by all of their pairs
+                entry["mentee_languages"] = mentee_labels[i]
+                entry["mentor_languages"] = mentor_labels[j]
+            results[(mentee_id, mentor_id)] = entry
+
+    # ------------------------------
+    # Count pairs per common language
+    # ------------------------------
+    counts = np.bincount(lang_code.ravel(), minlength=4).tolist()
+    summary["German"] += counts[0]
+    summary["English"] += counts[1]
+    for i, j in np.argwhere(lang_code == _OTHER).tolist():
+        summary[shared_other[i, j]] = summary.get(shared_other[i, j], 0) + 1
+    summary["No common language"] += counts[_NO_COMMON]
 
     # ------------------------------
-    # Print summary statistics
+    # Log summary statistics
     # ------------------------------
     total_pairs = len(results)
     communicative_pairs = total_pairs - summary["No common language"]
 
-    print(" Language compatibility computed (B1+ threshold, combined score model)")
-    print(f" {communicative_pairs}/{total_pairs} pairs can communicate effectively")
-    print(f" Breakdown: {summary}")
+    log.info("Language compatibility computed (B1+ threshold, combined score model)")
+    log.info("%d/%d pairs can communicate effectively", communicative_pairs, total_pairs)
+    log.info("Breakdown: %s", summary)
 
     return results
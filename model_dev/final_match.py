@@ -1,63 +1,164 @@
 import json
+import math
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from typing import Dict, Any, List, Optional
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:
+    linear_sum_assignment = None
+
+try:
+    import lap
+except ImportError:
+    lap = None
+
+# From this many mentees/mentors on, lap's LAPJV solver is preferred over scipy
+_LAPJV_MIN_SIZE = 200
+
+# Values accepted by perform_matching(method=...)
+MATCHING_METHODS = ("greedy", "optimal")
+
 
 # -------------------------------------------------------------
 # Utility functions
 # -------------------------------------------------------------
 def load_json(path):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    """Load a JSON file (decoded with orjson when it is installed)."""
+    with open(path, "rb") as f:
+        return _decode_json(f.read())
+
+
+def _decode_json(raw):
+    """Decode JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # e.g. NaN/Infinity written by json.dump, which orjson rejects
+            pass
+    return json.loads(raw)
+
+
+def _load_json_shared(path):
+    """
+    Load a results file through the decode cache used by _load_scores. The
+    returned objects are shared with the cache, so they must not be modified
+    or handed out.
+    """
+    stat = os.stat(path)
+    return _load_json_cached(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=32)
+def _load_json_cached(path, mtime_ns, size):
+    """Cached by (path, mtime, size), so a rewritten file is decoded again."""
+    with open(path, "rb") as f:
+        return _decode_json(f.read())
+
+
+@lru_cache(maxsize=1 << 16)
+def _parse_pair_key(pair_key):
+    """
+    Split a "mentee_id-mentor_id" key into (mentee_id, mentor_id) integers.
+    Cached, as the same keys are parsed by combine_scores, perform_matching
+    and compute_final_matches_from_data.
+    """
+    mentee_id, mentor_id = pair_key.split('-')
+    return int(mentee_id), int(mentor_id)
 
 
 # -------------------------------------------------------------
 # Combine partial scores into one dictionary
 # -------------------------------------------------------------
+def _load_scores(path, category, score_key):
+    """
+    Load one results file and keep only {pair: score}. Reads the shared
+    cached data without copying it; nothing here modifies it.
+    """
+    return {pair: data[score_key] for pair, data in _load_json_shared(path)[category].items()}
+
+
 def combine_scores(results_dir):
     """Combine all result JSONs into a unified dictionary of pair → scores."""
-    gender = load_json(os.path.join(results_dir, "results_gender.json"))["gender"]
-    languages = load_json(os.path.join(results_dir, "results_languages.json"))["languages"]
-    academia = load_json(os.path.join(results_dir, "results_academia.json"))["academia"]
-    geo = load_json(os.path.join(results_dir, "results_geographic_proximity.json"))["geographic_proximity"]
+    categories = {
+        "gender": ("results_gender.json", "gender_score"),
+        "languages": ("results_languages.json", "score"),
+        "academia": ("results_academia.json", "academic_score"),
+        "geographic_proximity": ("results_geographic_proximity.json", "distance_score"),
+    }
+    # Read, decode and project the files concurrently
+    with ThreadPoolExecutor(max_workers=len(categories)) as executor:
+        gender, languages, academia, geo = executor.map(
+            _load_scores,
+            [os.path.join(results_dir, filename) for filename, _ in categories.values()],
+            categories,
+            [score_key for _, score_key in categories.values()],
+        )
 
     all_pairs = set(gender.keys()) & set(languages.keys()) & set(academia.keys()) & set(geo.keys())
 
-    combined = {}
-    for pair in all_pairs:
-        g = gender[pair]["gender_score"]
-        lang = languages[pair]["score"]
-        a = academia[pair]["academic_score"]
-        d = geo[pair]["distance_score"]
-
-        # even if invalid, keep pair but mark it
-        valid = (g > 0 and lang > 0)
-        total_score = 0.7 * a + 0.3 * d if valid else 0.0
-
-        combined[pair] = {
-            "total_score": round(float(total_score), 3),
-            "academic_score": round(float(a), 3),
-            "gender_score": round(float(g), 3),
-            "language_score": round(float(lang), 3),
-            "distance_score": round(float(d), 3),
-            "valid": valid,
+    # One aligned float array per category, combined vectorized
+    pairs = list(all_pairs)
+    g = np.fromiter((gender[p] for p in pairs), dtype=np.float64, count=len(pairs))
+    lang = np.fromiter((languages[p] for p in pairs), dtype=np.float64, count=len(pairs))
+    a = np.fromiter((academia[p] for p in pairs), dtype=np.float64, count=len(pairs))
+    d = np.fromiter((geo[p] for p in pairs), dtype=np.float64, count=len(pairs))
+
+    # even if invalid, keep pair but mark it
+    valid = (g > 0) & (lang > 0)
+    with np.errstate(invalid="ignore"):
+        total_score = np.where(valid, 0.7 * a + 0.3 * d, 0.0)
+
+    combined = {
+        pair: {
+            "total_score": round(t, 3),
+            "academic_score": round(a_k, 3),
+            "gender_score": round(g_k, 3),
+            "language_score": round(l_k, 3),
+            "distance_score": round(d_k, 3),
+            "valid": v,
         }
-
-    print(f"📊 Total pairs loaded: {len(combined)} (including invalid)")
-    valid_count = sum(1 for v in combined.values() if v["valid"])
-    print(f"✅ Valid pairs (gender>0 & language>0): {valid_count}")
-
-    mentees = sorted({int(p.split('-')[0]) for p in combined})
-    mentors = sorted({int(p.split('-')[1]) for p in combined})
-    print(f"Mentees: {mentees}")
-    print(f"Mentors: {mentors}")
-
-    # Optional preview
-    print("\n📋 Preview of all mentor–mentee pairs:")
-    for p, v in list(combined.items())[:15]:
+        for pair, t, a_k, g_k, l_k, d_k, v in zip(
+            pairs, total_score.tolist(), a.tolist(), g.tolist(), lang.tolist(),
+            d.tolist(), valid.tolist(),
+        )
+    }
+
+    valid_count = int(np.count_nonzero(valid))
+    pair_ids = [_parse_pair_key(p) for p in combined]
+    mentees = sorted({m for m, _ in pair_ids})
+    mentors = sorted({n for _, n in pair_ids})
+
+    # The report is collected and printed in one go
+    lines = [
+        f"📊 Total pairs loaded: {len(combined)} (including invalid)",
+        f"✅ Valid pairs (gender>0 & language>0): {valid_count}",
+        f"Mentees: {mentees}",
+        f"Mentors: {mentors}",
+        # Optional preview
+        "\n📋 Preview of all mentor–mentee pairs:",
+    ]
+    for p, v in islice(combined.items(), 15):
         m, n = p.split('-')
         tag = "⭐" if v["valid"] else "❌"
-        print(f"{tag} Mentee {m} – Mentor {n} | Total={v['total_score']}")
+        lines.append(f"{tag} Mentee {m} – Mentor {n} | Total={v['total_score']}")
+    print("\n".join(lines))
 
     return combined
 
@@ -65,59 +166,231 @@ def combine_scores(results_dir):
 # -------------------------------------------------------------
 # Perform 1–1 matching (unique mentor & mentee)
 # -------------------------------------------------------------
-def perform_matching(combined):
-    """Greedy 1–1 matching ensuring all mentees and mentors get paired."""
-    valid_pairs = [
-        (int(p.split('-')[0]), int(p.split('-')[1]), p, data["total_score"])
-        for p, data in combined.items() if data["valid"]
+def _greedy_match(mentee_idx, mentor_idx, n_mentees, n_mentors):
+    """
+    Walk the (already ranked) pairs and keep each pair whose mentee and
+    mentor are both still free. Returns the positions of the kept pairs.
+    """
+    mentee_free = np.ones(n_mentees, dtype=np.bool_)
+    mentor_free = np.ones(n_mentors, dtype=np.bool_)
+    chosen = np.empty(min(n_mentees, n_mentors), dtype=np.int64)
+    count = 0
+    for k in range(len(mentee_idx)):
+        mi = mentee_idx[k]
+        mj = mentor_idx[k]
+        if mentee_free[mi] and mentor_free[mj]:
+            chosen[count] = k
+            count += 1
+            mentee_free[mi] = False
+            mentor_free[mj] = False
+    return chosen[:count]
+
+
+def _optimal_match(pairs):
+    """
+    1–1 matching with the maximum total score, via _solve_assignment.
+
+    Mirrors the greedy passes: manual matches (score inf) are always kept,
+    valid pairs are preferred, invalid pairs only fill otherwise unmatched
+    participants, and missing pairs or scores <= -1 are never selected.
+    """
+    mentee_index = {m: i for i, m in enumerate(dict.fromkeys(m for m, _, _, _, _ in pairs))}
+    mentor_index = {n: j for j, n in enumerate(dict.fromkeys(n for _, n, _, _, _ in pairs))}
+    if not mentee_index or not mentor_index:
+        return []
+
+    rows = np.array([mentee_index[m] for m, _, _, _, _ in pairs], dtype=np.int64)
+    cols = np.array([mentor_index[n] for _, n, _, _, _ in pairs], dtype=np.int64)
+    scores = np.array([score for _, _, _, score, _ in pairs], dtype=np.float64)
+    valid = np.array([ok for _, _, _, _, ok in pairs], dtype=np.bool_)
+
+    # Cost tiers, each larger than any possible sum of the tier below it
+    finite = np.abs(scores[valid & np.isfinite(scores)])
+    size = min(len(mentee_index), len(mentor_index)) + 1
+    filler = size * 2 * (finite.max(initial=0.0) + 1.0)
+    forbidden = size * filler
+    forced = -size * forbidden
+
+    # Scatter the pair costs into the dense matrix in one go
+    usable = scores > -1
+    with np.errstate(invalid="ignore"):
+        pair_cost = np.where(valid, np.where(scores == np.inf, forced, -scores), filler)
+    cost = np.full((len(mentee_index), len(mentor_index)), forbidden)
+    cost[rows[usable], cols[usable]] = pair_cost[usable]
+    position = np.full(cost.shape, -1, dtype=np.int64)
+    position[rows, cols] = np.arange(len(pairs))
+
+    rows, cols = _solve_assignment(cost)
+    return [
+        pairs[position[i, j]][2] for i, j in zip(rows.tolist(), cols.tolist()) if cost[i, j] < forbidden
     ]
 
-    # Sort valid pairs by total_score
-    sorted_pairs = sorted(valid_pairs, key=lambda x: x[3], reverse=True)
 
-    matched_mentees = set()
-    matched_mentors = set()
-    selected_pairs = []
+def _shortest_augmenting_path(cost):
+    """
+    Minimum-cost assignment of a cost matrix with no more rows than columns
+    (Hungarian method with potentials, one shortest augmenting path per
+    row). Returns the column assigned to each row. Only used compiled by
+    numba, when neither scipy nor lap is installed.
+    """
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    row_of = np.zeros(m + 1, dtype=np.int64)  # 1-based row matched to each column, 0 = free
+    way = np.zeros(m + 1, dtype=np.int64)
+    for i in range(1, n + 1):
+        row_of[0] = i
+        j0 = 0
+        min_slack = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=np.bool_)
+        while True:
+            used[j0] = True
+            i0 = row_of[j0]
+            delta = np.inf
+            j1 = 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    slack = cost[i0 - 1, j - 1] - u[i0] - v[j]
+                    if slack < min_slack[j]:
+                        min_slack[j] = slack
+                        way[j] = j0
+                    if min_slack[j] < delta:
+                        delta = min_slack[j]
+                        j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[row_of[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_slack[j] -= delta
+            j0 = j1
+            if row_of[j0] == 0:
+                break
+        # Flip the augmenting path back to its root
+        while j0 != 0:
+            j1 = way[j0]
+            row_of[j0] = row_of[j1]
+            j0 = j1
+
+    col_of_row = np.empty(n, dtype=np.int64)
+    for j in range(1, m + 1):
+        if row_of[j] != 0:
+            col_of_row[row_of[j] - 1] = j - 1
+    return col_of_row
+
+
+def _solve_assignment(cost):
+    """
+    Minimum-cost assignment of a dense cost matrix as (rows, cols) index
+    arrays. Large matrices go to lap.lapjv when installed, everything else
+    to scipy's linear_sum_assignment; without either, the numba-compiled
+    _shortest_augmenting_path is used.
+    """
+    if lap is not None and (linear_sum_assignment is None or max(cost.shape) >= _LAPJV_MIN_SIZE):
+        # extend_cost pads rectangular matrices; rows left unassigned get -1
+        _, row_to_col, _ = lap.lapjv(np.ascontiguousarray(cost), extend_cost=True)
+        rows = np.flatnonzero(row_to_col >= 0)
+        return rows, row_to_col[rows]
+    if linear_sum_assignment is not None:
+        return linear_sum_assignment(cost)
+
+    # The kernel wants rows <= columns, so solve the transpose if needed
+    if cost.shape[0] <= cost.shape[1]:
+        cols = _shortest_augmenting_path(np.ascontiguousarray(cost))
+        return np.arange(len(cols)), cols
+    rows = _shortest_augmenting_path(np.ascontiguousarray(cost.T))
+    order = np.argsort(rows)
+    return rows[order], order
+
+
+# Compile the greedy loop and the assignment kernel to native code when numba is installed
+if njit is not None:
+    _greedy_match = njit(cache=True)(_greedy_match)
+    _greedy_match(np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int64), 1, 1)  # warm up the JIT
+    _shortest_augmenting_path = njit(cache=True)(_shortest_augmenting_path)
+    _shortest_augmenting_path(np.zeros((1, 1)))
+
+
+def perform_matching(combined, method="greedy"):
+    """
+    Greedy 1–1 matching ensuring all mentees and mentors get paired.
+
+    With method="optimal" the pairs are chosen by solving the assignment
+    problem instead (maximum total score, see _optimal_match). This needs
+    scipy, lap or numba; without any of them the greedy matching is used.
+    """
+    if method not in MATCHING_METHODS:
+        raise ValueError(f"Unknown matching method: {method!r}")
 
-    # First pass: match valid pairs greedily
-    for mentee, mentor, pair_key, score in sorted_pairs:
-        if mentee not in matched_mentees and mentor not in matched_mentors:
-            selected_pairs.append(pair_key)
-            matched_mentees.add(mentee)
-            matched_mentors.add(mentor)
+    # Parse every "mentee-mentor" key once
+    pairs = [
+        (*_parse_pair_key(p), p, data["total_score"], data["valid"])
+        for p, data in combined.items()
+    ]
 
-    all_mentees = {int(p.split('-')[0]) for p in combined}
-    all_mentors = {int(p.split('-')[1]) for p in combined}
+    if method == "optimal":
+        if linear_sum_assignment is not None or lap is not None or njit is not None:
+            selected_pairs = _optimal_match(pairs)
+            print(f"\n🎯 Final 1–1 matches (optimal): {len(selected_pairs)} total.")
+            return selected_pairs
+        print("⚠️ None of scipy, lap or numba is installed, falling back to greedy matching.")
+
+    # Rank all pairs by total_score once (stable, so ties keep their input
+    # order); the greedy pass and the fallback lists both reuse this order
+    scores = np.array([score for _, _, _, score, _ in pairs], dtype=np.float64)
+    ranked = [pairs[k] for k in np.argsort(-scores, kind="stable").tolist()]
+    valid_pairs = [(m, n, p, score) for m, n, p, score, valid in ranked if valid]
+
+    # Compact 0..M-1 / 0..N-1 indices for the participants
+    mentee_index = {m: i for i, m in enumerate(dict.fromkeys(m for m, _, _, _ in valid_pairs))}
+    mentor_index = {n: j for j, n in enumerate(dict.fromkeys(n for _, n, _, _ in valid_pairs))}
+    mentee_idx = np.array([mentee_index[m] for m, _, _, _ in valid_pairs], dtype=np.int64)
+    mentor_idx = np.array([mentor_index[n] for _, n, _, _ in valid_pairs], dtype=np.int64)
+
+    # First pass: match valid pairs greedily (valid_pairs is already ranked)
+    chosen = _greedy_match(mentee_idx, mentor_idx, len(mentee_index), len(mentor_index))
+    selected_pairs = [valid_pairs[k][2] for k in chosen.tolist()]
+    matched_mentees = {valid_pairs[k][0] for k in chosen.tolist()}
+    matched_mentors = {valid_pairs[k][1] for k in chosen.tolist()}
+
+    all_mentees = {m for m, _, _, _, _ in pairs}
+    all_mentors = {n for _, n, _, _, _ in pairs}
+    unmatched_mentees = all_mentees - matched_mentees
+    unmatched_mentors = all_mentors - matched_mentors
+
+    # Candidate lists for the fallback passes, only for the participants the
+    # first pass left unmatched: one scan of the ranked list, so each group
+    # is best-first
+    by_mentee: Dict[int, list] = {m: [] for m in unmatched_mentees}
+    by_mentor: Dict[int, list] = {n: [] for n in unmatched_mentors}
+    if by_mentee or by_mentor:
+        for m, n, p, score, _ in ranked:
+            if m in by_mentee:
+                by_mentee[m].append((score, n, p))
+            if n in by_mentor:
+                by_mentor[n].append((score, m, p))
 
     # Second pass: handle unmatched mentees
-    for mentee in all_mentees - matched_mentees:
-        best_pair = None
-        best_score = -1
-        for p, data in combined.items():
-            m, n = map(int, p.split('-'))
-            if m == mentee and n not in matched_mentors:
-                if data["total_score"] > best_score:
-                    best_pair = p
-                    best_score = data["total_score"]
-        if best_pair:
-            selected_pairs.append(best_pair)
-            matched_mentees.add(mentee)
-            matched_mentors.add(int(best_pair.split('-')[1]))
+    for mentee in unmatched_mentees:
+        for score, mentor, p in by_mentee[mentee]:
+            if score <= -1:
+                break
+            if mentor not in matched_mentors:
+                selected_pairs.append(p)
+                matched_mentees.add(mentee)
+                matched_mentors.add(mentor)
+                break
 
     # Third pass: handle unmatched mentors (symmetry)
     for mentor in all_mentors - matched_mentors:
-        best_pair = None
-        best_score = -1
-        for p, data in combined.items():
-            m, n = map(int, p.split('-'))
-            if n == mentor and m not in matched_mentees:
-                if data["total_score"] > best_score:
-                    best_pair = p
-                    best_score = data["total_score"]
-        if best_pair:
-            selected_pairs.append(best_pair)
-            matched_mentees.add(int(best_pair.split('-')[0]))
-            matched_mentors.add(mentor)
+        for score, mentee, p in by_mentor[mentor]:
+            if score <= -1:
+                break
+            if mentee not in matched_mentees:
+                selected_pairs.append(p)
+                matched_mentees.add(mentee)
+                matched_mentors.add(mentor)
+                break
 
     print(f"\n🎯 Final 1–1 matches: {len(selected_pairs)} total.")
     return selected_pairs
@@ -129,31 +402,74 @@ def perform_matching(combined):
 # -------------------------------------------------------------
 def save_results(selected_pairs, combined, output_path):
     """Save all pairs with 'selected' flag for matched ones."""
-    result = {}
+    # The flag is set on the combined dicts for the write and removed again
+    # afterwards, instead of copying every pair's dict
+    selected = set(selected_pairs)
     for pair, data in combined.items():
-        result[pair] = {
-            **data,
-            "selected": pair in selected_pairs,
-        }
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(result, f, indent=2, ensure_ascii=False)
-
-    print(f"\n💾 Results saved to {output_path}")
-
-    print("\n🏆 Final matches:")
+        data["selected"] = pair in selected
+    try:
+        # orjson writes inf/NaN as null, so those results go through the json module
+        if orjson is not None and all(
+            math.isfinite(value)
+            for data in combined.values() for value in data.values() if isinstance(value, float)
+        ):
+            with open(output_path, "wb") as f:
+                f.write(orjson.dumps(combined, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_path, "w", encoding="utf-8") as f:
+                json.dump(combined, f, indent=2, ensure_ascii=False)
+    finally:
+        for data in combined.values():
+            del data["selected"]
+
+    lines = [f"\n💾 Results saved to {output_path}", "\n🏆 Final matches:"]
     for p in selected_pairs:
         m, n = p.split('-')
-        print(f"  Mentee {m} → Mentor {n} | Score: {combined[p]['total_score']:.3f}")
+        lines.append(f"  Mentee {m} → Mentor {n} | Score: {combined[p]['total_score']:.3f}")
+    print("\n".join(lines))
 
 
 # -------------------------------------------------------------
 # Compute final matches from in-memory data (for backend use)
 # -------------------------------------------------------------
+def _to_float(val):
+    """Convert a score to float; "inf"/"-inf" strings are kept, anything unusable becomes 0.0."""
+    if val is None:
+        return 0.0
+    if isinstance(val, str):
+        if val.lower() in ('inf', 'infinity'):
+            return float('inf')
+        if val.lower() in ('-inf', '-infinity'):
+            return float('-inf')
+    try:
+        return float(val)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def _pair_key(key):
+    """Convert a (mentee_id, mentor_id) tuple key to a "mentee_id-mentor_id" string key."""
+    if isinstance(key, tuple) and len(key) == 2:
+        return f"{key[0]}-{key[1]}"
+    return str(key)
+
+
+def _flatten_scores(category_results, score_key):
+    """
+    Flatten one category's results into {"mentee_id-mentor_id": score}.
+    Entries may be {score_key: value} dicts or bare values.
+    """
+    flat = {}
+    for key, data in category_results.items():
+        flat[_pair_key(key)] = _to_float(data.get(score_key, data) if isinstance(data, dict) else data)
+    return flat
+
+
 def compute_final_matches_from_data(
     results: Dict[str, Any],
     manual_matches: Optional[List[str]] = None,
     manual_non_matches: Optional[List[str]] = None,
+    matching_method: str = "greedy",
 ) -> List[Dict[str, Any]]:
     """
     Compute final matches from results dictionary returned by main.py.
@@ -173,6 +489,7 @@ def compute_final_matches_from_data(
             Note: Keys can be tuples (mentee_id, mentor_id) or strings "mentee_id-mentor_id"
         manual_matches: Optional list of pairs to force as matches (format: "mentor_id-mentee_id")
         manual_non_matches: Optional list of pairs to exclude (format: "mentor_id-mentee_id")
+        matching_method: "greedy" (default) or "optimal", see perform_matching()
     
     Returns:
         List of final matched pairs, each as a dictionary with:
@@ -187,124 +504,91 @@ def compute_final_matches_from_data(
             "age_difference_score": float,
         }
     """
-    # Normalize keys to string format "mentee_id-mentor_id"
-    def normalize_key(key):
-        """Convert tuple key to string key."""
-        if isinstance(key, tuple) and len(key) == 2:
-            return f"{key[0]}-{key[1]}"
-        return str(key)
-    
-    # Convert all results to use string keys
-    normalized_results = {}
-    for category, category_results in results.items():
-        normalized_results[category] = {
-            normalize_key(k): v for k, v in category_results.items()
-        }
-    
-    gender = normalized_results.get("gender", {})
-    languages = normalized_results.get("languages", {})
-    academia = normalized_results.get("academia", {})
-    age_difference = normalized_results.get("age_difference", {})
-    geo = normalized_results.get("geographic_proximity", {})
+    # Flatten each category once to {"mentee_id-mentor_id": float score}
+    gender = _flatten_scores(results.get("gender", {}), "gender_score")
+    languages = _flatten_scores(results.get("languages", {}), "score")
+    academia = _flatten_scores(results.get("academia", {}), "academic_score")
+    age_difference = _flatten_scores(results.get("age_difference", {}), "birthday_score")
+    geo = _flatten_scores(results.get("geographic_proximity", {}), "distance_score")
     
     # Get all pairs that exist in all categories
     all_pairs = set(gender.keys()) & set(languages.keys()) & set(academia.keys()) & set(geo.keys())
     if age_difference:
         all_pairs = all_pairs & set(age_difference.keys())
     
-    # Combine scores for each pair
-    combined = {}
-    for pair in all_pairs:
-        # Extract scores (handle different key names in different categories)
-        g_data = gender.get(pair, {})
-        l_data = languages.get(pair, {})
-        a_data = academia.get(pair, {})
-        d_data = geo.get(pair, {})
-        age_data = age_difference.get(pair, {}) if age_difference else {}
-        
-        # Get scores - handle both dict values and direct values
-        g = g_data.get("gender_score", g_data) if isinstance(g_data, dict) else g_data
-        lang = l_data.get("score", l_data) if isinstance(l_data, dict) else l_data
-        a = a_data.get("academic_score", a_data) if isinstance(a_data, dict) else a_data
-        d = d_data.get("distance_score", d_data) if isinstance(d_data, dict) else d_data
-        age = age_data.get("birthday_score", age_data) if isinstance(age_data, dict) else age_data
-        
-        # Convert to float, handle inf/-inf
-        def to_float(val):
-            if val is None:
-                return 0.0
-            if isinstance(val, str):
-                if val.lower() in ('inf', 'infinity'):
-                    return float('inf')
-                if val.lower() in ('-inf', '-infinity'):
-                    return float('-inf')
-            try:
-                return float(val) if val is not None else 0.0
-            except (ValueError, TypeError):
-                return 0.0
-        
-        g = to_float(g)
-        lang = to_float(lang)
-        a = to_float(a)
-        d = to_float(d)
-        age = to_float(age) if age_data else 0.0
-        
-        # Validate pair (hard constraints: gender > 0 and language > 0)
-        valid = (g > 0 and lang > 0)
-        
-        # Calculate total score: 0.7 * academia + 0.3 * geographic (only for valid pairs)
-        total_score = 0.7 * a + 0.3 * d if valid else 0.0
-        
-        # Handle manual matches/non-matches
-        # Note: pair is in "mentee_id-mentor_id" format, but manual_matches/non_matches
-        # come in "mentor_id-mentee_id" format from frontend, so we need to check both formats
-        mentee_id_str, mentor_id_str = pair.split('-')
-        pair_mentor_mentee_format = f"{mentor_id_str}-{mentee_id_str}"  # Convert to "mentor_id-mentee_id"
-        
-        if manual_matches:
-            # Check both formats
-            if pair in manual_matches or pair_mentor_mentee_format in manual_matches:
-                total_score = float('inf')
-                valid = True
-        
-        if manual_non_matches:
-            # Check both formats
-            if pair in manual_non_matches or pair_mentor_mentee_format in manual_non_matches:
-                total_score = float('-inf')
-                valid = False
-        
-        combined[pair] = {
-            "total_score": round(float(total_score), 3),
-            "academic_score": round(float(a), 3),
-            "gender_score": round(float(g), 3),
-            "language_score": round(float(lang), 3),
-            "distance_score": round(float(d), 3),
-            "age_difference_score": round(float(age), 3),
-            "valid": valid,
+    # Combine scores for all pairs at once: one aligned array per category
+    pairs = list(all_pairs)
+    g = np.array([gender[p] for p in pairs], dtype=np.float64)
+    lang = np.array([languages[p] for p in pairs], dtype=np.float64)
+    a = np.array([academia[p] for p in pairs], dtype=np.float64)
+    d = np.array([geo[p] for p in pairs], dtype=np.float64)
+    age = np.array([age_difference.get(p, 0.0) for p in pairs], dtype=np.float64)
+
+    # Validate pairs (hard constraints: gender > 0 and language > 0)
+    valid = (g > 0) & (lang > 0)
+
+    # Calculate total score: 0.7 * academia + 0.3 * geographic (only for valid pairs)
+    with np.errstate(invalid="ignore"):
+        total_score = np.where(valid, 0.7 * a + 0.3 * d, 0.0)
+
+    # Handle manual matches/non-matches
+    # Note: pair is in "mentee_id-mentor_id" format, but manual_matches/non_matches
+    # come in "mentor_id-mentee_id" format from frontend, so we need to check both formats
+    if manual_matches or manual_non_matches:
+        forced = set(manual_matches or ())
+        excluded = set(manual_non_matches or ())
+        for k, pair in enumerate(pairs):
+            mentee_id_str, mentor_id_str = pair.split('-')
+            pair_mentor_mentee_format = f"{mentor_id_str}-{mentee_id_str}"  # Convert to "mentor_id-mentee_id"
+            if pair in forced or pair_mentor_mentee_format in forced:
+                total_score[k] = float('inf')
+                valid[k] = True
+            if pair in excluded or pair_mentor_mentee_format in excluded:
+                total_score[k] = float('-inf')
+                valid[k] = False
+
+    combined = {
+        pair: {
+            "total_score": round(t, 3),
+            "academic_score": round(a_k, 3),
+            "gender_score": round(g_k, 3),
+            "language_score": round(l_k, 3),
+            "distance_score": round(d_k, 3),
+            "age_difference_score": round(age_k, 3),
+            "valid": v,
         }
+        for pair, t, a_k, g_k, l_k, d_k, age_k, v in zip(
+            pairs, total_score.tolist(), a.tolist(), g.tolist(), lang.tolist(),
+            d.tolist(), age.tolist(), valid.tolist(),
+        )
+    }
     
     print(f"📊 Total pairs combined: {len(combined)} (including invalid)")
-    valid_count = sum(1 for v in combined.values() if v["valid"])
+    valid_count = int(np.count_nonzero(valid))
     print(f"✅ Valid pairs (gender>0 & language>0): {valid_count}")
     
     # Perform matching
-    selected_pairs = perform_matching(combined)
+    selected_pairs = perform_matching(combined, method=matching_method)
     
     # Return ALL pairs (not just matched ones) so frontend can calculate recommendations
     # Each pair includes total_score and all category scores
     # This matches the structure in results_final.json: all pairs with total_score, valid, and is_matched flag
+    # The combined dicts are only used here from now on, so they are completed
+    # in place and returned instead of being copied
+    selected = set(selected_pairs)
     all_pairs = []
-    for pair_key, match_data in combined.items():
-        mentee_id, mentor_id = map(int, pair_key.split('-'))
-        pair_data = match_data.copy()
+    for pair_key, pair_data in combined.items():
+        mentee_id, mentor_id = _parse_pair_key(pair_key)
         pair_data["mentor_id"] = mentor_id
         pair_data["mentee_id"] = mentee_id
-        pair_data["is_matched"] = pair_key in selected_pairs  # Flag to indicate if this is in final 1-to-1 matching
+        pair_data["is_matched"] = pair_key in selected  # Flag to indicate if this is in final 1-to-1 matching
         all_pairs.append(pair_data)
     
-    print(f"\n🎯 Returning {len(all_pairs)} total pairs (including {len(selected_pairs)} final matched pairs).")
-    print(f"   Structure: Each pair has mentor_id, mentee_id, total_score, and all category scores")
-    print(f"   Sample pair: {all_pairs[0] if all_pairs else 'None'}")
+    print(
+        f"\n🎯 Returning {len(all_pairs)} total pairs (including {len(selected_pairs)} final matched pairs).\n"
+        f"   Structure: Each pair has mentor_id, mentee_id, total_score, and all category scores\n"
+        f"   Sample pair: {all_pairs[0] if all_pairs else 'None'}"
+    )
     return all_pairs
 
 
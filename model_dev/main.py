@@ -1,9 +1,24 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional, Union, BinaryIO, TextIO
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple, Union, BinaryIO, TextIO
 import pandas as pd
+import hashlib
 import json
+import logging
 import sys
 import io
+import math
+import threading
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+log = logging.getLogger(__name__)
 
 # ------------------------------------
 # Imports
@@ -34,16 +49,51 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = BASE_DIR / "data"
 
 
+# ------------------------------------
+# Default Importance Modifiers
+# ------------------------------------
+_DEFAULT_MODIFIERS: Mapping[str, float] = MappingProxyType({
+    "gender": 1.0,
+    "academia": 1.0,
+    "languages": 1.0,
+    "age_difference": 1.0,
+    "geographic_proximity": 1.0,
+})
+
+
 # ------------------------------------
 # Helper to load CSVs
 # ------------------------------------
 def _load_csv(csv_path: Path) -> pd.DataFrame:
-    """Safely load a CSV file."""
-    if not csv_path.exists():
-        raise FileNotFoundError(f"CSV not found: {csv_path}")
+    """Safely load a CSV file (parsed once per file version, see _read_csv_cached)."""
+    try:
+        stat = csv_path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"CSV not found: {csv_path}") from None
+    return _read_csv_cached(csv_path.resolve(), stat.st_mtime_ns, stat.st_size).copy()
+
+
+@lru_cache(maxsize=8)
+def _read_csv_cached(csv_path: Path, mtime_ns: int, size: int) -> pd.DataFrame:
+    """Parse a CSV; cached by (path, mtime, size), so an edited file is parsed again."""
     return pd.read_csv(csv_path)
 
 
+@lru_cache(maxsize=16)
+def _parse_csv_bytes(csv_bytes: bytes) -> pd.DataFrame:
+    """
+    Parse CSV content. Cached by content, so re-submitting the same uploads
+    (e.g. with other matching parameters) skips parsing.
+    """
+    return pd.read_csv(io.BytesIO(csv_bytes))
+
+
+def _load_csvs(loader, *sources) -> list:
+    """Load several CSVs concurrently (pandas' C parser releases the GIL)."""
+    with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+        return list(executor.map(loader, sources))
+
+
 def _load_csv_from_data(csv_data: Union[pd.DataFrame, BinaryIO, TextIO, bytes, str, Path]) -> pd.DataFrame:
     """
     Load CSV data from various input types.
@@ -51,7 +101,7 @@ def _load_csv_from_data(csv_data: Union[pd.DataFrame, BinaryIO, TextIO, bytes, s
     Args:
         csv_data: Can be:
             - A pandas DataFrame (already loaded) - returned as-is
-            - A file-like object (BytesIO, TextIOWrapper, etc.) - read via pd.read_csv()
+            - A file-like object (BytesIO, TextIOWrapper, etc.) - read once, then parsed
             - bytes - converted to BytesIO and read
             - str - treated as file path or CSV content
             - Path - treated as file path
@@ -72,22 +122,25 @@ def _load_csv_from_data(csv_data: Union[pd.DataFrame, BinaryIO, TextIO, bytes, s
         # Try as file path first
         path = Path(csv_data)
         if path.exists():
-            return pd.read_csv(path)
+            return _load_csv(path)
         # Otherwise treat as CSV content
         return pd.read_csv(io.StringIO(csv_data))
     
-    # If it's bytes, convert to BytesIO
+    # If it's bytes, parse it (cached by content, see _parse_csv_bytes)
     if isinstance(csv_data, bytes):
-        return pd.read_csv(io.BytesIO(csv_data))
+        return _parse_csv_bytes(csv_data).copy()
     
-    # For file-like objects (IO streams, BytesIO, etc.), read directly
+    # For file-like objects (IO streams, BytesIO, etc.), read the payload once
     # Reset position to start in case it was already read
     try:
         csv_data.seek(0)
     except (AttributeError, OSError):
         pass  # Some objects don't support seek
     
-    return pd.read_csv(csv_data)
+    data = csv_data.read()
+    if isinstance(data, str):
+        return pd.read_csv(io.StringIO(data))
+    return _parse_csv_bytes(data).copy()
 
 
 # ------------------------------------
@@ -96,10 +149,75 @@ def _load_csv_from_data(csv_data: Union[pd.DataFrame, BinaryIO, TextIO, bytes, s
 def merge_datasets(app_df: pd.DataFrame, interview_df: pd.DataFrame, id_col: str) -> pd.DataFrame:
     """Merge two datasets (application + interview) on the given ID column."""
     merged = pd.merge(app_df, interview_df, on=id_col, how="outer", suffixes=("_app", "_int"))
-    print(f"✅ Merged {len(app_df)} application + {len(interview_df)} interview entries → {len(merged)} total ({id_col})")
+    log.info("Merged %d application + %d interview entries -> %d total (%s)", len(app_df), len(interview_df), len(merged), id_col)
     return merged
 
 
+def _prepare_frames(
+    mentee_app: pd.DataFrame,
+    mentee_int: pd.DataFrame,
+    mentor_app: pd.DataFrame,
+    mentor_int: pd.DataFrame,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Merge application + interview data and normalize the column names."""
+    mentees_df = merge_datasets(mentee_app, mentee_int, id_col="Mentee Number")
+    mentors_df = merge_datasets(mentor_app, mentor_int, id_col="Mentor Number")
+
+    # Normalize column names (remove hidden whitespace/newlines)
+    mentees_df.columns = [" ".join(col.split()) for col in mentees_df.columns]
+    mentors_df.columns = [" ".join(col.split()) for col in mentors_df.columns]
+
+    log.info("All datasets loaded and merged")
+    log.info("Mentees: %d | Mentors: %d", len(mentees_df), len(mentors_df))
+    return mentees_df, mentors_df
+
+
+# ------------------------------------
+# Run the five categories
+# ------------------------------------
+def _run_categories(
+    mentees_df: pd.DataFrame,
+    mentors_df: pd.DataFrame,
+    importance_modifiers: Mapping[str, float],
+    age_max_difference: Optional[int],
+    geographic_max_distance: Optional[int],
+    only: Optional[Tuple[str, ...]] = None,
+) -> Dict[str, Any]:
+    """
+    Run the categories one after another on the merged frames
+    (all of them, or only the given ones, in the usual order).
+    """
+    categories = {
+        "gender": ("Gender", gender.gender_results, {}),
+        "academia": ("Academia", academia.academia_results, {}),
+        "languages": ("Language", languages.languages_results, {}),
+        "age_difference": (
+            "Age Difference",
+            age_difference.age_difference_results,
+            {"age_max_difference": age_max_difference},
+        ),
+        "geographic_proximity": (
+            "Geographic Proximity",
+            geographic_proximity.geographic_proximity_results,
+            {"geographic_max_distance": geographic_max_distance},
+        ),
+    }
+
+    results = {}
+    for category, (label, run_category, options) in categories.items():
+        if only is not None and category not in only:
+            continue
+        log.info("Running %s matching...", label)
+        results[category] = run_category(
+            mentees_df=mentees_df,
+            mentors_df=mentors_df,
+            importance_modifier=importance_modifiers[category],
+            **options,
+        )
+
+    return results
+
+
 # ------------------------------------
 # Main Runner
 # ------------------------------------
@@ -114,82 +232,22 @@ def run_all_categories(
     """Run all categories: gender, academia, languages, age difference, and proximity."""
 
     # ------------------ Load all CSVs ------------------
-    mentee_app = _load_csv(mentee_app_csv)
-    mentee_int = _load_csv(mentee_int_csv)
-    mentor_app = _load_csv(mentor_app_csv)
-    mentor_int = _load_csv(mentor_int_csv)
-
-    # ------------------ Merge application + interview ------------------
-    mentees_df = merge_datasets(mentee_app, mentee_int, id_col="Mentee Number")
-    mentors_df = merge_datasets(mentor_app, mentor_int, id_col="Mentor Number")
-
-    # Normalize column names (remove hidden whitespace/newlines)
-    mentees_df.columns = mentees_df.columns.str.strip().str.replace(r"\s+", " ", regex=True)
-    mentors_df.columns = mentors_df.columns.str.strip().str.replace(r"\s+", " ", regex=True)
-
-    print("✅ All datasets loaded & merged successfully.")
-    print(f"Mentees: {len(mentees_df)} | Mentors: {len(mentors_df)}\n")
-
-    # ------------------ Importance Modifiers ------------------
-    importance_modifiers = {
-        "gender": 1.0,
-        "academia": 1.0,
-        "languages": 1.0,
-        "age_difference": 1.0,
-        "geographic_proximity": 1.0,
-    }
-
-    # ------------------ Category 1: Gender ------------------
-    print("⚙️ Running Gender Matching...")
-    gender_results = gender.gender_results(
-        mentees_df=mentees_df,
-        mentors_df=mentors_df,
-        importance_modifier=importance_modifiers["gender"],
-    )
-
-    # ------------------ Category 2: Academia ------------------
-    print("⚙️ Running Academia Matching...")
-    academia_results_data = academia.academia_results(
-        mentees_df=mentees_df,
-        mentors_df=mentors_df,
-        importance_modifier=importance_modifiers["academia"],
+    mentee_app, mentee_int, mentor_app, mentor_int = _load_csvs(
+        _load_csv, mentee_app_csv, mentee_int_csv, mentor_app_csv, mentor_int_csv
     )
 
-    # ------------------ Category 3: Languages ------------------
-    print("⚙️ Running Language Matching...")
-    languages_results = languages.languages_results(
-        mentees_df=mentees_df,
-        mentors_df=mentors_df,
-        importance_modifier=importance_modifiers["languages"],
-    )
+    # ------------------ Merge application + interview ------------------
+    mentees_df, mentors_df = _prepare_frames(mentee_app, mentee_int, mentor_app, mentor_int)
 
-    # ------------------ Category 4: Age Difference ------------------
-    print("⚙️ Running Age Difference Matching...")
-    age_results = age_difference.age_difference_results(
-        mentees_df=mentees_df,
-        mentors_df=mentors_df,
-        importance_modifier=importance_modifiers["age_difference"],
+    results = _run_categories(
+        mentees_df,
+        mentors_df,
+        _DEFAULT_MODIFIERS,
         age_max_difference=age_max_difference,
-    )
-
-    # ------------------ Category 5: Geographic Proximity ------------------
-    print("⚙️ Running Geographic Proximity Matching...")
-    geo_results = geographic_proximity.geographic_proximity_results(
-        mentees_df=mentees_df,
-        mentors_df=mentors_df,
-        importance_modifier=importance_modifiers["geographic_proximity"],
         geographic_max_distance=geographic_max_distance,
     )
-
-    print("\n✅ All matching categories completed successfully.\n")
-
-    return {
-        "gender": gender_results,
-        "academia": academia_results_data,
-        "languages": languages_results,
-        "age_difference": age_results,
-        "geographic_proximity": geo_results,
-    }
+    log.info("All matching categories completed")
+    return results
 
 
 # ------------------------------------
@@ -234,114 +292,126 @@ def run_all_categories_from_data(
         - age_difference
         - geographic_proximity
     """
-    # Load CSV data from various input types
-    mentee_app = _load_csv_from_data(mentee_app_csv)
-    mentee_int = _load_csv_from_data(mentee_int_csv)
-    mentor_app = _load_csv_from_data(mentor_app_csv)
-    mentor_int = _load_csv_from_data(mentor_int_csv)
-    
-    # Merge application + interview data
-    mentees_df = merge_datasets(mentee_app, mentee_int, id_col="Mentee Number")
-    mentors_df = merge_datasets(mentor_app, mentor_int, id_col="Mentor Number")
-    
-    # Normalize column names (remove hidden whitespace/newlines)
-    mentees_df.columns = mentees_df.columns.str.strip().str.replace(r"\s+", " ", regex=True)
-    mentors_df.columns = mentors_df.columns.str.strip().str.replace(r"\s+", " ", regex=True)
-    
-    print("✅ All datasets loaded & merged successfully.")
-    print(f"Mentees: {len(mentees_df)} | Mentors: {len(mentors_df)}\n")
-    
-    # Prepare importance modifiers (default to 1.0 for all if not provided)
+    # Prepare importance modifiers (default to 1.0 for all if not provided,
+    # missing categories keep their default)
     if importance_modifiers is None:
-        importance_modifiers = {
-            "gender": 1.0,
-            "academia": 1.0,
-            "languages": 1.0,
-            "age_difference": 1.0,
-            "geographic_proximity": 1.0,
-        }
+        importance_modifiers = _DEFAULT_MODIFIERS
     else:
-        # Ensure all required categories are present with defaults
-        default_modifiers = {
-            "gender": 1.0,
-            "academia": 1.0,
-            "languages": 1.0,
-            "age_difference": 1.0,
-            "geographic_proximity": 1.0,
-        }
-        importance_modifiers = {**default_modifiers, **importance_modifiers}
+        importance_modifiers = {**_DEFAULT_MODIFIERS, **importance_modifiers}
     
-    # ------------------ Category 1: Gender ------------------
-    print("⚙️ Running Gender Matching...")
-    gender_results = gender.gender_results(
-        mentees_df=mentees_df,
-        mentors_df=mentors_df,
-        importance_modifier=importance_modifiers["gender"],
-    )
-
-    # ------------------ Category 2: Academia ------------------
-    print("⚙️ Running Academia Matching...")
-    academia_results_data = academia.academia_results(
-        mentees_df=mentees_df,
-        mentors_df=mentors_df,
-        importance_modifier=importance_modifiers["academia"],
-    )
+    sources = (mentee_app_csv, mentee_int_csv, mentor_app_csv, mentor_int_csv)
 
-    # ------------------ Category 3: Languages ------------------
-    print("⚙️ Running Language Matching...")
-    languages_results = languages.languages_results(
-        mentees_df=mentees_df,
-        mentors_df=mentors_df,
-        importance_modifier=importance_modifiers["languages"],
-    )
+    # Load CSV data from various input types
+    mentee_app, mentee_int, mentor_app, mentor_int = _load_csvs(_load_csv_from_data, *sources)
     
-    # ------------------ Category 4: Age Difference ------------------
-    print("⚙️ Running Age Difference Matching...")
-    age_results = age_difference.age_difference_results(
-        mentees_df=mentees_df,
-        mentors_df=mentors_df,
-        importance_modifier=importance_modifiers["age_difference"],
+    # Merge application + interview data
+    mentees_df, mentors_df = _prepare_frames(mentee_app, mentee_int, mentor_app, mentor_int)
+
+    if not all(isinstance(source, bytes) for source in sources):
+        results = _run_categories(
+            mentees_df,
+            mentors_df,
+            importance_modifiers,
+            age_max_difference=age_max_difference,
+            geographic_max_distance=geographic_max_distance,
+        )
+        log.info("All matching categories completed")
+        return results
+
+    # Identical uploads + parameters reuse the earlier results of the memoized
+    # categories; geographic proximity is always recomputed (see _MEMOIZED_CATEGORIES)
+    key = _results_cache_key(sources, importance_modifiers, age_max_difference)
+    with _results_cache_lock:
+        memoized = _results_cache.get(key)
+        if memoized is not None:
+            _results_cache.move_to_end(key)
+    if memoized is None:
+        memoized = _run_categories(
+            mentees_df,
+            mentors_df,
+            importance_modifiers,
+            age_max_difference=age_max_difference,
+            geographic_max_distance=geographic_max_distance,
+            only=_MEMOIZED_CATEGORIES,
+        )
+        with _results_cache_lock:
+            _results_cache[key] = memoized
+            while len(_results_cache) > _RESULTS_CACHE_SIZE:
+                _results_cache.popitem(last=False)
+
+    # Fresh outer dicts per call; the per-pair entries are shared with the cache
+    results = {category: dict(scores) for category, scores in memoized.items()}
+    results.update(_run_categories(
+        mentees_df,
+        mentors_df,
+        importance_modifiers,
         age_max_difference=age_max_difference,
-    )
-
-    # ------------------ Category 5: Geographic Proximity ------------------
-    print("⚙️ Running Geographic Proximity Matching...")
-    geo_results = geographic_proximity.geographic_proximity_results(
-        mentees_df=mentees_df,
-        mentors_df=mentors_df,
-        importance_modifier=importance_modifiers["geographic_proximity"],
         geographic_max_distance=geographic_max_distance,
-    )
-    
-    print("\n✅ All matching categories completed successfully.\n")
-
-    return {
-        "gender": gender_results,
-        "academia": academia_results_data,
-        "languages": languages_results,
-        "age_difference": age_results,
-        "geographic_proximity": geo_results,
-    }
+        only=("geographic_proximity",),
+    ))
+    log.info("All matching categories completed")
+    return results
+
+
+# Categories whose results depend only on the uploaded data and parameters.
+# Geographic proximity is left out: it falls back to straight-line distances
+# when the routing API fails, and a fallback result must not be replayed.
+_MEMOIZED_CATEGORIES = ("gender", "academia", "languages", "age_difference")
+
+# Small LRU of memoized results, keyed on a digest so the uploads are not retained
+_RESULTS_CACHE_SIZE = 4
+_results_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+_results_cache_lock = threading.Lock()
+
+
+def _results_cache_key(
+    sources: Tuple[bytes, ...],
+    importance_modifiers: Mapping[str, float],
+    age_max_difference: Optional[int],
+) -> bytes:
+    """blake2b digest of the uploaded CSVs and the parameters of the memoized categories."""
+    digest = hashlib.blake2b(digest_size=32)
+    for source in sources:
+        digest.update(len(source).to_bytes(8, "little"))
+        digest.update(source)
+    modifiers = sorted((category, float(value)) for category, value in importance_modifiers.items())
+    digest.update(repr((modifiers, age_max_difference)).encode())
+    return digest.digest()
 
 
 # ------------------------------------
 # Save Results
 # ------------------------------------
-if __name__ == "__main__":
+def _write_json(path: Path, data: Dict[str, Any]) -> None:
+    """
+    Write `data` as indented JSON. orjson is used when installed, except
+    for inf/NaN scores, which it would write as null.
+    """
+    finite = all(
+        math.isfinite(value)
+        for results in data.values()
+        for entry in results.values()
+        for value in (entry.values() if isinstance(entry, dict) else (entry,))
+        if isinstance(value, float)
+    )
+    if orjson is not None and finite:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def main() -> None:
+    """Run all categories on the default CSVs and save one results JSON per category."""
     output = run_all_categories()
 
     # ------------------ Convert tuple keys (m, n) → "m-n" for JSON ------------------
     for category, results in output.items():
-        converted = {}
-        for k, v in results.items():
-            # If key is a tuple like (mentee_id, mentor_id)
-            if isinstance(k, tuple) and len(k) == 2:
-                m, n = k
-                converted[f"{m}-{n}"] = v
-            else:
-                # Key already a string or unexpected format
-                converted[str(k)] = v
-        output[category] = converted
+        # Tuple keys like (mentee_id, mentor_id); anything else is kept as str(key)
+        output[category] = {
+            (f"{k[0]}-{k[1]}" if isinstance(k, tuple) and len(k) == 2 else str(k)): v
+            for k, v in results.items()
+        }
 
 
     # ------------------ Save JSONs ------------------
@@ -352,15 +422,21 @@ if __name__ == "__main__":
         "age_difference": "results_age_difference.json",
         "geographic_proximity": "results_geographic_proximity.json",
     }
-    
+
+    # Files are independent, so write them concurrently; report in a fixed order
+    with ThreadPoolExecutor(max_workers=len(files_to_save)) as executor:
+        list(executor.map(
+            lambda item: _write_json(BASE_DIR / item[1], {item[0]: output[item[0]]}),
+            files_to_save.items(),
+        ))
 
     for category, filename in files_to_save.items():
-        out_path = BASE_DIR / filename
-        with open(out_path, "w", encoding="utf-8") as f:
-            json.dump({category: output[category]}, f, indent=2, ensure_ascii=False)
         print(f"💾 Saved {category} results → {filename}")
 
     print("\n🎯 All results successfully exported.\n")
 
-    
 
+if __name__ == "__main__":
+    # INFO by default; set the level to DEBUG for per-pair details
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
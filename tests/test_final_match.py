@@ -0,0 +1,13 @@
+import json
+
+from model_dev import final_match
+
+
+def test_load_json_returns_independent_copies(tmp_path):
+    path = tmp_path / "results_gender.json"
+    path.write_text(json.dumps({"gender": {"1-2": {"gender_score": 0.75}}}))
+
+    first = final_match.load_json(path)
+    first["gender"]["1-2"]["gender_score"] = -1.0
+
+    assert final_match.load_json(path) == {"gender": {"1-2": {"gender_score": 0.75}}}
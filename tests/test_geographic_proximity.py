@@ -0,0 +1,163 @@
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+TRACKED_CACHE_DIR = ROOT / "temp" / "geographic_data"
+
+
+@pytest.fixture
+def geo(tmp_path, monkeypatch):
+    """The geographic proximity module with its cache files redirected to tmp_path."""
+    from model_dev.categories import geographic_proximity as geo
+
+    monkeypatch.setattr(geo, "DISTANCE_CACHE_FILE", tmp_path / "distances.json")
+    monkeypatch.setattr(geo, "DISTANCE_DB_FILE", tmp_path / "distances.db")
+    monkeypatch.setattr(geo, "LOCATION_CACHE_FILE", tmp_path / "location_mappings.json")
+    monkeypatch.setattr(geo, "LOCATION_LOG_FILE", tmp_path / "location_mappings.jsonl")
+    for name in ("_location_cache", "_location_entries", "_distance_cache"):
+        monkeypatch.setattr(geo, name, {})
+    monkeypatch.setattr(geo, "_distance_db", None)
+    monkeypatch.setattr(geo, "_distances_dirty", False)
+    monkeypatch.setattr(geo, "_distances_loaded", False)
+    monkeypatch.setattr(geo, "_location_log_entries", 0)
+    yield geo
+    if geo._distance_db is not None:
+        geo._distance_db.close()
+
+# Runs in a separate interpreter so every step starts from a fresh import.
+# The cache files are pointed at a temporary directory before the cache is loaded.
+_CACHE_SCRIPT = """
+import sys
+from pathlib import Path
+from model_dev.categories import geographic_proximity as geo
+
+tmp = Path(sys.argv[1])
+geo.DISTANCE_CACHE_FILE = tmp / "distances.json"
+geo.DISTANCE_DB_FILE = tmp / "distances.db"
+geo.LOCATION_CACHE_FILE = tmp / "location_mappings.json"
+geo.LOCATION_LOG_FILE = tmp / "location_mappings.jsonl"
+geo._load_distance_cache()
+
+key = geo._cache_key_for_coords((8.541042, 47.374449), (8.729150, 47.499172))
+if sys.argv[2] == "save":
+    geo._cache_distance(key, 24.7151)
+else:
+    print(geo._distance_cache[key])
+"""
+
+
+def _run(tmp_path, mode):
+    result = subprocess.run(
+        [sys.executable, "-c", _CACHE_SCRIPT, str(tmp_path), mode],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return result.stdout.strip()
+
+
+def test_import_does_not_open_the_distance_database():
+    result = subprocess.run(
+        [sys.executable, "-c",
+         "from model_dev.categories import geographic_proximity as geo; print(geo._distance_db)"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    assert result.stdout.strip() == "None"
+
+
+def test_saved_distance_survives_fresh_checkout(tmp_path):
+    _run(tmp_path, "save")
+
+    # distances.json is exported at exit and holds the new distance
+    exported = json.loads((tmp_path / "distances.json").read_text())
+    assert exported == {"8.541042,47.374449|8.729150,47.499172": 24.7151}
+
+    # A fresh checkout only has the tracked distances.json, not the database
+    for db_file in tmp_path.glob("distances.db*"):
+        db_file.unlink()
+
+    assert _run(tmp_path, "load") == "24.7151"
+
+
+class _FakeClock:
+    """Stands in for the time module: sleep() only advances monotonic()."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_rate_limit_allows_at_most_40_calls_per_minute(monkeypatch):
+    from model_dev.categories import geographic_proximity as geo
+
+    clock = _FakeClock()
+    monkeypatch.setattr(geo, "time", clock)
+    monkeypatch.setattr(geo, "_ors_tokens", geo._ORS_BUCKET_CAPACITY)
+    monkeypatch.setattr(geo, "_ors_last_refill", clock.now)
+
+    # Back-to-back bursts separated by idle periods of varying length
+    calls = []
+    for idle in (0, 0, 90, 5, 61, 0, 30):
+        clock.now += idle
+        for _ in range(50):
+            geo._wait_for_rate_limit()
+            calls.append(clock.now)
+
+    # Like ORS (and the old request log), a request counts for 60 s after it was made
+    for t in calls:
+        in_window = sum(1 for c in calls if t - geo._ORS_RATE_WINDOW < c <= t)
+        assert in_window <= geo._ORS_RATE_LIMIT
+
+
+def test_location_cache_keeps_the_tracked_file_format(geo, tmp_path):
+    shutil.copy(TRACKED_CACHE_DIR / "location_mappings.json", tmp_path)
+    original = (tmp_path / "location_mappings.json").read_text()
+    geo._load_cache()
+
+    # Lookups are normalized, the stored spelling is not
+    assert geo._city_to_coords(" zurich ") == tuple(json.loads(original)["Z\u00fcrich"])
+
+    geo._cache_location("Sankt Gallen", (9.3767, 47.4239))
+    geo._flush_caches()
+
+    expected = json.loads(original)
+    expected["Sankt Gallen"] = [9.3767, 47.4239]
+    assert (tmp_path / "location_mappings.json").read_text() == json.dumps(expected, indent=2)
+
+
+def _proximity(geo, monkeypatch, **kwargs):
+    """
+    Score a mentee in Zurich against mentors in Zurich (distance cached) and
+    Winterthur (not cached), with no routing API available.
+    """
+    import pandas as pd
+
+    zurich, winterthur = (8.541042, 47.374449), (8.729150, 47.499172)
+    monkeypatch.setattr(geo, "_city_to_coords", {"Zurich": zurich, "Winterthur": winterthur}.get)
+    monkeypatch.delenv("OPEN_ROUTE_SERVICE", raising=False)
+    geo._cache_distance(geo._cache_key_for_coords(zurich, zurich), 0.0)
+
+    mentees = pd.DataFrame({"Mentee Number": [1], "Residence (city)": ["Zurich"]})
+    mentors = pd.DataFrame({"Mentor Number": [2, 3], "Postadresse / Postal address": ["Zurich", "Winterthur"]})
+    results = geo.geographic_proximity_results(mentees, mentors, **kwargs)
+    assert results[(1, 2)]["distance_score"] == 1.0
+    return results[(1, 3)]["distance_score"]
+
+
+def test_uncached_distance_scores_zero_by_default(geo, monkeypatch):
+    assert _proximity(geo, monkeypatch) == 0.0
+
+
+def test_straight_line_fallback_scores_haversine_distance(geo, monkeypatch):
+    straight_km = geo._haversine_distance_km((8.541042, 47.374449), (8.729150, 47.499172))
+    score = _proximity(geo, monkeypatch, straight_line_fallback=True)
+    assert score == round(1.0 - straight_km / 200, 3)
+    assert score > 0.0
@@ -0,0 +1,33 @@
+import pandas as pd
+
+from model_dev.categories import languages
+
+
+def test_shared_language_skips_filler_words():
+    assert languages._shared_other_language("Tigrinya and Arabic", "Tigrinya and French") == "Tigrinya"
+    assert languages._shared_other_language("Arabic and Tigrinya", "French and Tigrinya") == "Tigrinya"
+    assert languages._shared_other_language("Arabic (native), C1", "Arabic - native, C1") == "Arabic"
+
+
+def test_shared_language_follows_mentee_order():
+    assert languages._shared_other_language("Turkish, Arabic", "Arabic, Turkish") == "Turkish"
+    assert languages._shared_other_language("Turkish", "French") is None
+
+
+def test_common_language_reported_in_results():
+    mentees = pd.DataFrame({
+        "Mentee Number": [1],
+        "German": ["A1"],
+        "English": ["A2"],
+        "Further language skills": ["Tigrinya and Arabic"],
+    })
+    mentors = pd.DataFrame({
+        "Mentor Number": [7],
+        "Deutsch": ["C2"],
+        "Englisch": ["C1"],
+        "Weitere Sprachkenntnisse / Other language skills": ["Tigrinya and French"],
+    })
+
+    result = languages.languages_results(mentees, mentors)
+
+    assert result[(1, 7)]["common_language"] == "Tigrinya"